@@ -6,66 +6,314 @@ import os
 import subprocess
 import shutil
 import re
+import json
+import functools
+import threading
+from collections import OrderedDict
+from glob import glob
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Set, Tuple, Any
 from .gpu_detector import GPUDetector
 
+# Windows短路径API在导入时解析一次
+_GetShortPathNameW = None
+if os.name == 'nt':
+    try:
+        import ctypes
+        from ctypes import wintypes
+        
+        _GetShortPathNameW = ctypes.windll.kernel32.GetShortPathNameW
+        _GetShortPathNameW.argtypes = [wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD]
+        _GetShortPathNameW.restype = wintypes.DWORD
+    except Exception:
+        _GetShortPathNameW = None
+
+# 短路径缓冲区按线程复用
+_SHORT_PATH_BUFFER_SIZE = 1024
+_short_path_tls = threading.local()
+
+
+# 常见的FFmpeg可能位置（导入时计算一次）
+_POSSIBLE_FFMPEG_PATHS: Tuple[str, ...] = (
+    "ffmpeg",  # 系统PATH中
+    "ffmpeg.exe",  # Windows
+    "/usr/bin/ffmpeg",  # Linux标准位置
+    "/usr/local/bin/ffmpeg",  # Linux本地安装
+    "/opt/homebrew/bin/ffmpeg",  # macOS Homebrew ARM
+    "/usr/local/Cellar/ffmpeg/*/bin/ffmpeg",  # macOS Homebrew Intel
+)
+
+# Windows额外路径
+if os.name == 'nt':
+    _POSSIBLE_FFMPEG_PATHS += (
+        "C:\\ffmpeg\\bin\\ffmpeg.exe",
+        "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe",
+        "C:\\Program Files (x86)\\ffmpeg\\bin\\ffmpeg.exe",
+    )
+
+# 预编译的正则表达式，避免每次调用时重复编译
+_VERSION_RE = re.compile(rb'ffmpeg version (\S+)')
+# 发行版版本号的主/次版本（如 6.1、n4.4.2）；N-开头的是开发快照
+_RELEASE_VERSION_RE = re.compile(r'n?(\d+)\.(\d+)')
+
+# 视频信息字段的融合正则，一次扫描即可提取所有字段（组名即字段名）
+_VIDEO_INFO_RE = re.compile(
+    r'Duration: (?P<duration>\d{2}:\d{2}:\d{2}\.\d{2})'
+    r'|(?P<resolution>\d{3,4}x\d{3,4})'
+    r'|Video: (?P<video_codec>\w+)'
+    r'|Audio: (?P<audio_codec>\w+)'
+    r'|bitrate: (?P<bitrate>\d+) kb/s'
+    r'|(?P<frame_rate>\d+(?:\.\d+)?)\s*fps'
+)
+_VIDEO_INFO_FIELDS = ("duration", "resolution", "video_codec", "audio_codec", "bitrate", "frame_rate")
+
+# 支持的文件扩展名（元组保持原有顺序供外部展示，集合用于O(1)查找）
+_VIDEO_FORMATS = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp')
+_SUB_FORMATS = ('.srt', '.ass', '.ssa', '.vtt', '.sub')
+_VIDEO_EXTS = frozenset(_VIDEO_FORMATS)
+_SUB_EXTS = frozenset(_SUB_FORMATS)
+
+# 字幕颜色名称到十六进制值的映射
+_COLOR_HEX = {
+    "white": "FFFFFF",
+    "black": "000000",
+    "red": "FF0000",
+    "green": "00FF00",
+    "blue": "0000FF",
+    "yellow": "FFFF00",
+    "cyan": "00FFFF",
+    "magenta": "FF00FF"
+}
+
+# 字幕滤镜与force_style模板（预先定义，构建命令时只做一次format）
+_SUBTITLE_FILTER_TEMPLATE = "subtitles={path}:force_style='{style}'"
+_FORCE_STYLE_TEMPLATE = "FontSize={size},PrimaryColour=&H{color}"
+
+# 各GPU模式下的质量参数（元组常量，构建命令时直接展开）
+_QUALITY_SETTINGS = {
+    # NVIDIA NVENC编码器 - 使用恒定质量VBR（-cq配合-b:v 0），NVENC不支持-crf
+    "nvenc": {
+        "low": ("-preset", "p2", "-rc", "vbr", "-cq", "28", "-b:v", "0"),
+        "medium": ("-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0"),
+        "high": ("-preset", "p6", "-rc", "vbr", "-cq", "19", "-b:v", "0")
+    },
+    # FFmpeg 4.4之前的NVENC没有p1-p7预设，使用旧的预设名
+    "nvenc_legacy": {
+        "low": ("-preset", "fast", "-rc", "vbr", "-cq", "28", "-b:v", "0"),
+        "medium": ("-preset", "medium", "-rc", "vbr", "-cq", "23", "-b:v", "0"),
+        "high": ("-preset", "slow", "-rc", "vbr", "-cq", "19", "-b:v", "0")
+    },
+    # AMD AMF编码器 - 使用恒定QP，AMF同样不支持-crf
+    "amf": {
+        "low": ("-quality", "speed", "-rc", "cqp", "-qp_i", "28", "-qp_p", "30"),
+        "medium": ("-quality", "balanced", "-rc", "cqp", "-qp_i", "22", "-qp_p", "24"),
+        "high": ("-quality", "quality", "-rc", "cqp", "-qp_i", "18", "-qp_p", "20")
+    },
+    # CPU编码器质量设置 - 使用CRF获得更好的压缩效率
+    "cpu": {
+        "low": ("-preset", "fast", "-crf", "28"),
+        "medium": ("-preset", "medium", "-crf", "23"),
+        "high": ("-preset", "slow", "-crf", "18")
+    }
+}
+
+# GPU编码器不可用时使用的软件编码器
+_SOFTWARE_ENCODERS = {"h264": "libx264", "hevc": "libx265"}
+
+# 字幕滤镜路径转义表（不加引号，按FFmpeg滤镜的两级转义规则处理）
+# 第一级为滤镜选项值：Windows反斜杠统一转为正斜杠，转义单引号和冒号（如盘符C:）
+_SUBTITLE_OPTION_ESCAPES = str.maketrans({"\\": "/", "'": "\\'", ":": "\\:"})
+# 第二级为滤镜图描述：转义反斜杠、单引号及 [ ] , ; 等分隔符
+_FILTERGRAPH_ESCAPES = str.maketrans({c: "\\" + c for c in "\\'[],;"})
+
+# 复制音频，不重新编码
+_AUDIO_COPY = ("-c:a", "copy")
+
+# 流复制切片参数：复制所有流，并把起始时间戳归零避免负时间戳
+_STREAM_COPY = ("-c", "copy", "-avoid_negative_ts", "make_zero")
+# 流复制到不同容器时只保留第一路视频和音频，字幕和数据流（如mkv的ASS字幕）
+# 在目标容器中往往没有对应的编码标签，复用时会失败
+_STREAM_COPY_AV_ONLY = ("-map", "0:v:0", "-map", "0:a?", "-sn", "-dn")
+
+# 流式解析FFmpeg输出的超时时间（秒）及输入信息结束标志
+_SCAN_TIMEOUT = 15
+_SCAN_END_MARKERS = ("Stream mapping:", "Output #", "Press [q]")
+
+# 文件大小单位
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# 视频信息缓存的最大条目数
+_INFO_CACHE_SIZE = 256
+
+# 并行探测FFmpeg候选路径的线程数：每个候选一个线程，总耗时不超过单次探测超时
+_PROBE_WORKERS = len(_POSSIBLE_FFMPEG_PATHS)
+
+
+@functools.lru_cache(maxsize=32)
+def _which(name: str) -> Optional[str]:
+    """缓存的shutil.which查找"""
+    return shutil.which(name)
+
+
+def format_file_size(size_bytes: int) -> str:
+    """
+    将字节数格式化为可读的文件大小
+    
+    Args:
+        size_bytes: 文件字节数
+        
+    Returns:
+        带单位的文件大小字符串
+    """
+    # 根据二进制位数直接确定单位，只需一次除法
+    unit_index = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.1f} {_SIZE_UNITS[unit_index]}"
+
+
+@functools.lru_cache(maxsize=8)
+def _supports_nvenc_p_presets(version: str) -> bool:
+    """
+    判断FFmpeg版本是否支持NVENC的p1-p7预设（FFmpeg 4.4及以上）
+    
+    Args:
+        version: -version输出中的版本字符串
+        
+    Returns:
+        是否支持；无法识别的版本按不支持处理，旧预设名在新版本中仍然可用
+    """
+    if version.startswith("N-"):
+        return True
+    match = _RELEASE_VERSION_RE.match(version)
+    if not match:
+        return False
+    return (int(match.group(1)), int(match.group(2))) >= (4, 4)
+
 
 class FFmpegManager:
     """FFmpeg管理器"""
     
+    __slots__ = (
+        'ffmpeg_path', 'version', 'is_valid', 'ffprobe_path', '_gpu_detector',
+        '_info_cache', '_path_test_cache', '_found_path',
+        '_gpu_args_cache', '_encoder_cache', '_escaped_subtitle_cache',
+        '_style_cache', '_active_probes'
+    )
+    
+    # 支持的格式为只读常量，所有实例共享
+    supported_formats = {
+        'video': _VIDEO_FORMATS,
+        'subtitle': _SUB_FORMATS
+    }
+    
     def __init__(self):
         self.ffmpeg_path: str = ""
         self.version: str = ""
         self.is_valid: bool = False
-        self.gpu_detector = GPUDetector()
-        self.supported_formats = {
-            'video': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp'],
-            'subtitle': ['.srt', '.ass', '.ssa', '.vtt', '.sub']
-        }
+        self.ffprobe_path: str = ""
+        # GPU检测器在首次使用时才创建，只做格式/时间校验的调用方无需承担初始化开销
+        self._gpu_detector: Optional[GPUDetector] = None
+        # 视频信息缓存，键为 (绝对路径, 修改时间, 文件大小)
+        self._info_cache: "OrderedDict[Tuple[str, int, int], Dict[str, any]]" = OrderedDict()
+        # 路径验证结果缓存（(绝对路径, 修改时间) -> 版本号，无效路径为None）
+        self._path_test_cache: Dict[Tuple[str, int], Optional[str]] = {}
+        self._found_path: Optional[str] = None
+        # GPU加速参数和编码器查找缓存，GPU检测结果变化时失效
+        self._gpu_args_cache: Dict[str, Tuple[str, ...]] = {}
+        self._encoder_cache: Dict[Tuple[str, str], str] = {}
+        # 已转义的字幕路径缓存
+        self._escaped_subtitle_cache: Dict[str, str] = {}
+        # 字幕样式片段缓存，键为 (字体大小, 小写颜色名)
+        self._style_cache: Dict[Tuple[int, str], str] = {}
+        # 正在运行的视频信息探测进程，程序退出时由terminate_probes终止
+        self._active_probes: Set[subprocess.Popen] = set()
+    
+    @property
+    def gpu_detector(self) -> GPUDetector:
+        """GPU检测器（延迟创建）"""
+        if self._gpu_detector is None:
+            self._gpu_detector = GPUDetector()
+        return self._gpu_detector
     
-    def find_ffmpeg(self) -> Optional[str]:
+    @gpu_detector.setter
+    def gpu_detector(self, detector: GPUDetector) -> None:
+        """替换GPU检测器，并清空依赖其检测结果的缓存"""
+        self._gpu_detector = detector
+        self._invalidate_gpu_caches()
+    
+    def find_ffmpeg(self, refresh: bool = False) -> Optional[str]:
         """
         自动查找FFmpeg可执行文件
         
+        Args:
+            refresh: 是否忽略之前的查找结果重新探测
+        
         Returns:
             FFmpeg路径，如果未找到则返回None
         """
-        # 常见的FFmpeg可能位置
-        possible_paths = [
-            "ffmpeg",  # 系统PATH中
-            "ffmpeg.exe",  # Windows
-            "/usr/bin/ffmpeg",  # Linux标准位置
-            "/usr/local/bin/ffmpeg",  # Linux本地安装
-            "/opt/homebrew/bin/ffmpeg",  # macOS Homebrew ARM
-            "/usr/local/Cellar/ffmpeg/*/bin/ffmpeg",  # macOS Homebrew Intel
-        ]
+        if refresh:
+            self._path_test_cache.clear()
+            self._found_path = None
+            # PATH中的ffmpeg可能已被安装、移除或替换
+            _which.cache_clear()
+        elif self._found_path:
+            return self._found_path
         
-        # Windows额外路径
-        if os.name == 'nt':
-            possible_paths.extend([
-                "C:\\ffmpeg\\bin\\ffmpeg.exe",
-                "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe",
-                "C:\\Program Files (x86)\\ffmpeg\\bin\\ffmpeg.exe",
-            ])
+        # 先把候选路径解析为实际文件并去重（PATH中的ffmpeg通常就是某个标准位置）；
+        # 通配符只在这里展开一次，之后的验证只处理具体路径
+        candidates: List[str] = []
+        for entry in _POSSIBLE_FFMPEG_PATHS:
+            paths = sorted(glob(entry)) if '*' in entry else (self._resolve_ffmpeg_path(entry),)
+            for resolved in paths:
+                if resolved and resolved not in candidates:
+                    candidates.append(resolved)
         
-        for path in possible_paths:
-            if self._test_ffmpeg_path(path):
-                return path
+        if not candidates:
+            return None
         
-        # 尝试使用which命令查找
+        # 常见情况下PATH中即有FFmpeg，只需启动一次进程验证
+        if self._test_ffmpeg_path(candidates[0]):
+            self._found_path = candidates[0]
+            return self._found_path
+        
+        # 并行探测其余候选路径，但按列表顺序选取第一个有效路径
+        remaining = candidates[1:]
+        executor = ThreadPoolExecutor(max_workers=_PROBE_WORKERS)
+        futures = []
         try:
-            result = shutil.which("ffmpeg")
-            if result and self._test_ffmpeg_path(result):
-                return result
-        except Exception:
-            pass
+            futures = [executor.submit(self._test_ffmpeg_path, path) for path in remaining]
+            for path, future in zip(remaining, futures):
+                if future.result():
+                    self._found_path = path
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
         
-        return None
+        return self._found_path
+    
+    def _resolve_ffmpeg_path(self, path: str) -> Optional[str]:
+        """
+        将候选路径解析为实际可执行文件路径
+        
+        不含目录分隔符的裸文件名通过PATH查找，其他路径原样返回；
+        无法解析时返回None，从而无需启动子进程
+        
+        Args:
+            path: 候选路径
+            
+        Returns:
+            解析后的路径，无法解析时返回None
+        """
+        if os.sep not in path and '/' not in path:
+            return _which(path)
+        
+        return path
     
     def _test_ffmpeg_path(self, path: str) -> bool:
         """
-        测试FFmpeg路径是否有效
+        测试FFmpeg路径是否有效（结果会被缓存）
         
         Args:
             path: FFmpeg路径
@@ -73,33 +321,60 @@ class FFmpegManager:
         Returns:
             是否有效
         """
+        return self._get_ffmpeg_version(path) is not None
+    
+    def _get_ffmpeg_version(self, path: str) -> Optional[str]:
+        """
+        获取FFmpeg版本号，同一可执行文件只探测一次
+        
+        缓存以 (绝对路径, 修改时间) 为键，可执行文件被替换后会重新探测
+        
+        Args:
+            path: FFmpeg路径
+            
+        Returns:
+            版本号，路径无效时返回None
+        """
+        resolved = self._resolve_ffmpeg_path(path)
+        if not resolved:
+            return None
+        
         try:
-            # 扩展路径中的通配符
-            if '*' in path:
-                from glob import glob
-                matches = glob(path)
-                if matches:
-                    path = matches[0]
-                else:
-                    return False
-            
-            if not os.path.exists(path):
-                return False
-            
-            # 尝试运行FFmpeg获取版本信息
+            mtime = os.stat(resolved).st_mtime_ns
+        except OSError:
+            return None
+        
+        cache_key = (os.path.abspath(resolved), mtime)
+        if cache_key not in self._path_test_cache:
+            self._path_test_cache[cache_key] = self._probe_ffmpeg_path(resolved)
+        return self._path_test_cache[cache_key]
+    
+    def _probe_ffmpeg_path(self, path: str) -> Optional[str]:
+        """
+        实际运行FFmpeg以验证路径，并从同一次输出中解析版本号
+        
+        Args:
+            path: 已解析的FFmpeg可执行文件路径
+            
+        Returns:
+            版本号，路径无效时返回None
+        """
+        try:
+            # -version输出只需匹配ASCII标记，直接处理字节，无需解码整个输出
             result = subprocess.run(
-                [path, "-version"],
+                [path, "-hide_banner", "-version"],
                 capture_output=True,
-                text=True,
-                timeout=5,
-                encoding='utf-8',
-                errors='ignore'
+                timeout=5
             )
             
-            return result.returncode == 0 and "ffmpeg version" in result.stdout.lower()
+            if result.returncode != 0 or b"ffmpeg version" not in result.stdout.lower():
+                return None
+            
+            version_match = _VERSION_RE.search(result.stdout)
+            return version_match.group(1).decode('ascii', 'ignore') if version_match else "未知版本"
         
         except Exception:
-            return False
+            return None
     
     def set_ffmpeg_path(self, path: str) -> bool:
         """
@@ -111,47 +386,101 @@ class FFmpegManager:
         Returns:
             设置是否成功
         """
-        if self._test_ffmpeg_path(path):
+        version = self._get_ffmpeg_version(path)
+        if version is not None:
             self.ffmpeg_path = path
             self.is_valid = True
-            self._get_version_info()
+            self.version = version
+            self.ffprobe_path = self._find_ffprobe(path)
             
             # 重要：设置FFmpeg路径后，检测GPU支持
-            self.gpu_detector.detect_gpus()
-            self.gpu_detector.check_ffmpeg_gpu_support(path)
+            self.gpu_detector.detect_all(path)
+            self._invalidate_gpu_caches()
             
             return True
         else:
             self.ffmpeg_path = ""
             self.is_valid = False
             self.version = ""
+            self.ffprobe_path = ""
             return False
     
-    def _get_version_info(self) -> None:
-        """获取FFmpeg版本信息"""
+    def get_probe_cache_entry(self) -> Optional[Dict[str, Any]]:
+        """
+        导出当前FFmpeg的探测结果，供保存后在下次启动时跳过探测
+        
+        Returns:
+            包含路径、修改时间、版本号和GPU加速支持情况的字典，
+            FFmpeg无效或GPU支持尚未检测时返回None
+        """
         if not self.is_valid:
-            return
+            return None
+        
+        resolved = self._resolve_ffmpeg_path(self.ffmpeg_path)
+        if not resolved:
+            return None
         
         try:
-            result = subprocess.run(
-                [self.ffmpeg_path, "-version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                encoding='utf-8',
-                errors='ignore'
-            )
+            mtime = os.stat(resolved).st_mtime_ns
+        except OSError:
+            return None
+        
+        support = GPUDetector.get_cached_ffmpeg_support(resolved)
+        if support is None:
+            return None
+        
+        return {
+            "path": resolved,
+            "mtime_ns": mtime,
+            "version": self.version,
+            "gpu_support": support
+        }
+    
+    def load_probe_cache_entry(self, entry: Dict[str, Any]) -> None:
+        """
+        用保存的探测结果预填版本号和GPU支持缓存
+        
+        缓存以 (绝对路径, 修改时间) 为键，可执行文件被替换后不会命中，仍会重新探测
+        
+        Args:
+            entry: get_probe_cache_entry导出的字典
+        """
+        # 配置文件可能被手工修改，字段类型不符的条目整体忽略
+        if not isinstance(entry, dict):
+            return
+        path = entry.get("path")
+        mtime = entry.get("mtime_ns")
+        version = entry.get("version")
+        support = entry.get("gpu_support")
+        if not (isinstance(path, str) and path
+                and isinstance(mtime, int) and not isinstance(mtime, bool)
+                and isinstance(version, str)
+                and isinstance(support, dict)
+                and all(isinstance(name, str) and isinstance(value, bool)
+                        for name, value in support.items())):
+            return
+        
+        self._path_test_cache.setdefault((os.path.abspath(path), mtime), version)
+        GPUDetector.prime_ffmpeg_support(path, mtime, support)
+    
+    def _find_ffprobe(self, ffmpeg_path: str) -> str:
+        """
+        查找与FFmpeg同目录的ffprobe可执行文件
+        
+        Args:
+            ffmpeg_path: FFmpeg路径
             
-            if result.returncode == 0:
-                # 解析版本号
-                version_match = re.search(r'ffmpeg version (\S+)', result.stdout)
-                if version_match:
-                    self.version = version_match.group(1)
-                else:
-                    self.version = "未知版本"
-        except Exception as e:
-            print(f"获取FFmpeg版本失败: {e}")
-            self.version = "版本获取失败"
+        Returns:
+            ffprobe路径，未找到则返回空字符串
+        """
+        resolved = self._resolve_ffmpeg_path(ffmpeg_path)
+        if not resolved:
+            return ""
+        
+        directory, filename = os.path.split(resolved)
+        ext = os.path.splitext(filename)[1]  # 保留Windows下的.exe扩展名
+        ffprobe_path = os.path.join(directory, "ffprobe" + ext)
+        return ffprobe_path if os.path.isfile(ffprobe_path) else ""
     
     def get_video_info(self, video_path: str) -> Dict[str, any]:
         """
@@ -163,43 +492,40 @@ class FFmpegManager:
         Returns:
             视频信息字典
         """
-        if not self.is_valid or not os.path.exists(video_path):
+        if not self.is_valid:
+            return {}
+        
+        try:
+            st = os.stat(video_path)
+        except OSError:
             return {}
         
+        # 文件未变化时直接返回缓存结果，避免重复启动FFmpeg进程
+        cache_key = (os.path.abspath(video_path), st.st_mtime_ns, st.st_size)
+        cached = self._info_cache.get(cache_key)
+        if cached is not None:
+            self._info_cache.move_to_end(cache_key)
+            return dict(cached)
+        
         try:
             # 处理长文件名和特殊字符
             # 在Windows上，如果路径太长或包含特殊字符，使用短路径或引号包装
             safe_video_path = self._make_safe_path(video_path)
             
-            cmd = [
-                self.ffmpeg_path, "-i", safe_video_path,
-                "-hide_banner", "-f", "null", "-",
-                "-v", "quiet"  # 减少输出，提高性能
-            ]
+            # 优先使用ffprobe获取结构化信息，不可用时退回解析FFmpeg输出
+            info = None
+            if self.ffprobe_path:
+                info = self._probe_video_info(safe_video_path)
+            if info is None:
+                info = self._scan_video_info(safe_video_path)
+            # 复用缓存键的stat结果，避免再次查询文件大小
+            info["file_size"] = format_file_size(st.st_size)
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=15,  # 减少超时时间
-                encoding='utf-8',
-                errors='ignore'
-            )
-            
-            # FFmpeg将信息输出到stderr
-            output = result.stderr
-            
-            info = {
-                "duration": self._extract_duration(output),
-                "resolution": self._extract_resolution(output),
-                "video_codec": self._extract_codec(output, "Video"),
-                "audio_codec": self._extract_codec(output, "Audio"),
-                "bitrate": self._extract_bitrate(output),
-                "frame_rate": self._extract_frame_rate(output),
-                "file_size": self._get_file_size(video_path)
-            }
+            self._info_cache[cache_key] = info
+            if len(self._info_cache) > _INFO_CACHE_SIZE:
+                self._info_cache.popitem(last=False)
             
-            return info
+            return dict(info)
         
         except subprocess.TimeoutExpired:
             print(f"获取视频信息超时: 文件名可能过长或包含特殊字符")
@@ -211,49 +537,217 @@ class FFmpegManager:
                 "audio_codec": "未知",
                 "bitrate": "未知",
                 "frame_rate": "未知",
-                "file_size": self._get_file_size(video_path)
+                "file_size": format_file_size(st.st_size)
             }
         except Exception as e:
             print(f"获取视频信息失败: {e}")
             return {}
     
-    def _extract_duration(self, output: str) -> str:
-        """从FFmpeg输出中提取时长"""
-        duration_match = re.search(r'Duration: (\d{2}:\d{2}:\d{2}\.\d{2})', output)
-        return duration_match.group(1) if duration_match else "未知"
+    def _probe_video_info(self, video_path: str) -> Optional[Dict[str, str]]:
+        """
+        使用ffprobe的JSON输出获取视频信息
+        
+        Args:
+            video_path: 视频文件路径
+            
+        Returns:
+            视频信息字典，ffprobe失败时返回None
+        """
+        cmd = [
+            self.ffprobe_path, "-v", "error",
+            "-show_entries",
+            "stream=codec_type,codec_name,width,height,r_frame_rate:format=duration,bit_rate",
+            "-of", "json", video_path
+        ]
+        
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            encoding='utf-8',
+            errors='ignore'
+        )
+        self._active_probes.add(process)
+        try:
+            stdout, _ = process.communicate(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            self._active_probes.discard(process)
+        
+        if process.returncode != 0:
+            return None
+        
+        try:
+            data = json.loads(stdout)
+        except ValueError:
+            return None
+        
+        video_stream = {}
+        audio_stream = {}
+        for stream in data.get("streams", []):
+            codec_type = stream.get("codec_type")
+            if codec_type == "video" and not video_stream:
+                video_stream = stream
+            elif codec_type == "audio" and not audio_stream:
+                audio_stream = stream
+        
+        fmt = data.get("format", {})
+        info = {
+            "duration": "未知",
+            "resolution": "未知",
+            "video_codec": video_stream.get("codec_name", "未知"),
+            "audio_codec": audio_stream.get("codec_name", "未知"),
+            "bitrate": "未知",
+            "frame_rate": "未知"
+        }
+        
+        try:
+            # 与FFmpeg输出一致，精确到百分之一秒
+            centiseconds = int(round(float(fmt["duration"]) * 100))
+            seconds, cs = divmod(centiseconds, 100)
+            hours, seconds = divmod(seconds, 3600)
+            minutes, seconds = divmod(seconds, 60)
+            info["duration"] = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{cs:02d}"
+        except (KeyError, ValueError):
+            pass
+        
+        if video_stream.get("width") and video_stream.get("height"):
+            info["resolution"] = f"{video_stream['width']}x{video_stream['height']}"
+        
+        try:
+            info["bitrate"] = f"{int(fmt['bit_rate']) // 1000} kb/s"
+        except (KeyError, ValueError):
+            pass
+        
+        try:
+            num, den = video_stream["r_frame_rate"].split('/')
+            fps = int(num) / int(den)
+            info["frame_rate"] = f"{fps:.2f}".rstrip('0').rstrip('.') + " fps"
+        except (KeyError, ValueError, ZeroDivisionError):
+            pass
+        
+        return info
+    
+    def _scan_video_info(self, video_path: str) -> Dict[str, str]:
+        """
+        解析FFmpeg的stderr输出获取视频信息（ffprobe不可用时的后备方案）
+        
+        逐行读取stderr，所有字段解析完成或输入信息输出结束后立即终止进程，
+        无需等待FFmpeg处理完整个文件
+        
+        Args:
+            video_path: 视频文件路径
+            
+        Returns:
+            视频信息字典
+        """
+        # 不指定输出：FFmpeg打印输入信息后立即退出，不会开始解码。
+        # 注意不能加 -v quiet，-v是全局选项，会连输入信息一起屏蔽
+        cmd = [self.ffmpeg_path, "-hide_banner", "-i", video_path]
+        
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1,
+            encoding='utf-8',
+            errors='ignore'
+        )
+        
+        # 超时保护：超时后杀死进程，使下面的读取循环结束
+        timed_out = threading.Event()
+        
+        def on_timeout():
+            timed_out.set()
+            process.kill()
+        
+        timer = threading.Timer(_SCAN_TIMEOUT, on_timeout)
+        # 计时线程不能阻止程序退出
+        timer.daemon = True
+        timer.start()
+        self._active_probes.add(process)
+        found: Dict[str, str] = {}
+        try:
+            for line in process.stderr:
+                # 输入信息之后是输出/映射信息，无需继续读取
+                if line.startswith(_SCAN_END_MARKERS):
+                    break
+                if self._scan_video_line(line, found):
+                    break
+        finally:
+            self._active_probes.discard(process)
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            process.stderr.close()
+        
+        if timed_out.is_set() and not found:
+            raise subprocess.TimeoutExpired(cmd, _SCAN_TIMEOUT)
+        
+        return self._format_video_info(found)
     
-    def _extract_resolution(self, output: str) -> str:
-        """从FFmpeg输出中提取分辨率"""
-        resolution_match = re.search(r'(\d{3,4}x\d{3,4})', output)
-        return resolution_match.group(1) if resolution_match else "未知"
+    def clear_info_cache(self) -> None:
+        """清空视频信息缓存"""
+        self._info_cache.clear()
     
-    def _extract_codec(self, output: str, stream_type: str) -> str:
-        """从FFmpeg输出中提取编解码器"""
-        pattern = rf'{stream_type}: (\w+)'
-        codec_match = re.search(pattern, output)
-        return codec_match.group(1) if codec_match else "未知"
+    def terminate_probes(self) -> None:
+        """终止所有正在运行的视频信息探测进程（窗口关闭时调用）"""
+        for process in list(self._active_probes):
+            try:
+                process.kill()
+            except OSError:
+                pass
     
-    def _extract_bitrate(self, output: str) -> str:
-        """从FFmpeg输出中提取比特率"""
-        bitrate_match = re.search(r'bitrate: (\d+) kb/s', output)
-        return f"{bitrate_match.group(1)} kb/s" if bitrate_match else "未知"
+    def _scan_video_line(self, text: str, found: Dict[str, str]) -> bool:
+        """
+        扫描一段FFmpeg输出，将首次出现的字段写入found
+        
+        Args:
+            text: FFmpeg输出片段
+            found: 已找到的字段字典
+            
+        Returns:
+            是否所有字段都已找到
+        """
+        for match in _VIDEO_INFO_RE.finditer(text):
+            field = match.lastgroup
+            if field in found:
+                continue  # 只保留第一次出现的值
+            found[field] = match.group(field)
+            if len(found) == len(_VIDEO_INFO_FIELDS):
+                return True
+        return False
     
-    def _extract_frame_rate(self, output: str) -> str:
-        """从FFmpeg输出中提取帧率"""
-        fps_match = re.search(r'(\d+(?:\.\d+)?)\s*fps', output)
-        return f"{fps_match.group(1)} fps" if fps_match else "未知"
+    def _format_video_info(self, found: Dict[str, str]) -> Dict[str, str]:
+        """
+        将扫描得到的原始字段格式化为视频信息字典
+        
+        Args:
+            found: 已找到的字段字典
+            
+        Returns:
+            视频信息字典，未找到的字段为"未知"
+        """
+        info = {field: found.get(field, "未知") for field in _VIDEO_INFO_FIELDS}
+        if "bitrate" in found:
+            info["bitrate"] = f"{found['bitrate']} kb/s"
+        if "frame_rate" in found:
+            info["frame_rate"] = f"{found['frame_rate']} fps"
+        return info
     
     def _get_file_size(self, file_path: str) -> str:
         """获取文件大小"""
         try:
             size_bytes = os.path.getsize(file_path)
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if size_bytes < 1024.0:
-                    return f"{size_bytes:.1f} {unit}"
-                size_bytes /= 1024.0
-            return f"{size_bytes:.1f} TB"
-        except Exception:
+        except OSError:
             return "未知"
+        return format_file_size(size_bytes)
     
     def _make_safe_path(self, file_path: str) -> str:
         """
@@ -269,30 +763,17 @@ class FFmpegManager:
             # 标准化路径
             normalized_path = os.path.normpath(file_path)
             
-            # Windows系统特殊处理
-            if os.name == 'nt':
-                # 检查路径长度
-                if len(normalized_path) > 260:
-                    try:
-                        # 尝试获取短路径名
-                        import ctypes
-                        from ctypes import wintypes
-                        
-                        GetShortPathNameW = ctypes.windll.kernel32.GetShortPathNameW
-                        GetShortPathNameW.argtypes = [wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD]
-                        GetShortPathNameW.restype = wintypes.DWORD
-                        
-                        buffer_size = 500
-                        buffer = ctypes.create_unicode_buffer(buffer_size)
-                        result = GetShortPathNameW(normalized_path, buffer, buffer_size)
-                        
-                        if result > 0:
-                            return buffer.value
-                    except Exception:
-                        pass
+            # Windows系统下，超长路径尝试获取短路径名
+            # 对于包含Unicode字符的路径，保持原样，subprocess.run() 会正确处理Unicode路径
+            if _GetShortPathNameW is not None and len(normalized_path) > 260:
+                buffer = getattr(_short_path_tls, "buffer", None)
+                if buffer is None:
+                    buffer = ctypes.create_unicode_buffer(_SHORT_PATH_BUFFER_SIZE)
+                    _short_path_tls.buffer = buffer
                 
-                # 对于包含Unicode字符的路径，保持原样
-                # subprocess.run() 会正确处理Unicode路径
+                result = _GetShortPathNameW(normalized_path, buffer, _SHORT_PATH_BUFFER_SIZE)
+                if 0 < result < _SHORT_PATH_BUFFER_SIZE:
+                    return buffer.value
             
             return normalized_path
             
@@ -306,7 +787,8 @@ class FFmpegManager:
                          start_time: str,
                          end_time: str,
                          gpu_mode: str = "cpu",
-                         quality: str = "medium") -> List[str]:
+                         quality: str = "medium",
+                         reencode: bool = True) -> List[str]:
         """
         构建视频切片命令
         
@@ -317,6 +799,10 @@ class FFmpegManager:
             end_time: 结束时间 (HH:MM:SS)
             gpu_mode: GPU模式 (cuda, amd, cpu)
             quality: 质量设置 (low, medium, high)
+            reencode: 是否重新编码；为False时直接复制音视频流，速度快但
+                切点会落在最近的关键帧上，且忽略gpu_mode和quality。
+                输出容器最好与输入相同（见get_cut_output_extension），
+                不同时只复制视频和音频流
             
         Returns:
             FFmpeg命令列表
@@ -324,38 +810,41 @@ class FFmpegManager:
         if not self.is_valid:
             raise ValueError("FFmpeg路径无效")
         
-        cmd = [self.ffmpeg_path]
+        if not reencode:
+            # 流复制：跳过解码和编码，只做时间范围裁剪
+            same_container = (os.path.splitext(input_file)[1].lower()
+                              == os.path.splitext(output_file)[1].lower())
+            return [
+                self.ffmpeg_path, "-y",
+                "-ss", start_time, "-to", end_time,
+                "-i", self._make_safe_path(input_file),
+                *(() if same_container else _STREAM_COPY_AV_ONLY),
+                *_STREAM_COPY,
+                self._make_safe_path(output_file)
+            ]
         
         # 添加GPU加速参数（包含高级优化）
-        gpu_args = self.gpu_detector.get_gpu_acceleration_args(gpu_mode, advanced=True)
-        cmd.extend(gpu_args)
-        
-        # 时间参数（在输入文件之前，更高效的seeking）
-        cmd.extend(["-ss", start_time, "-to", end_time])
-        
-        # 输入文件 - 使用安全路径
-        safe_input_file = self._make_safe_path(input_file)
-        cmd.extend(["-i", safe_input_file])
+        gpu_args = self._get_gpu_args(gpu_mode)
         
         # 编码器设置
-        video_encoder = self.gpu_detector.get_gpu_encoder(gpu_mode, "h264")
-        if video_encoder:
-            cmd.extend(["-c:v", video_encoder])
-        else:
-            cmd.extend(["-c:v", "libx264"])
+        video_encoder = self._get_video_encoder(gpu_mode, "h264")
         
         # 质量设置
-        quality_settings = self._get_quality_settings(quality, gpu_mode)
-        cmd.extend(quality_settings)
+        quality_settings = self._get_quality_settings(quality, video_encoder)
         
-        # 音频编码
-        cmd.extend(["-c:a", "copy"])  # 复制音频，不重新编码
-        
-        # 输出文件 - 使用安全路径
+        # 输入输出文件 - 使用安全路径
+        safe_input_file = self._make_safe_path(input_file)
         safe_output_file = self._make_safe_path(output_file)
-        cmd.append(safe_output_file)
         
-        return cmd
+        # 时间参数在输入文件之前，更高效的seeking
+        return [
+            self.ffmpeg_path, *gpu_args,
+            "-ss", start_time, "-to", end_time,
+            "-i", safe_input_file,
+            "-c:v", video_encoder, *quality_settings,
+            *_AUDIO_COPY,
+            safe_output_file
+        ]
     
     def build_subtitle_burn_command(self,
                                   input_file: str,
@@ -381,72 +870,125 @@ class FFmpegManager:
         if not self.is_valid:
             raise ValueError("FFmpeg路径无效")
         
-        cmd = [self.ffmpeg_path]
-        
         # 添加GPU加速参数（包含高级优化）
-        gpu_args = self.gpu_detector.get_gpu_acceleration_args(gpu_mode, advanced=True)
-        cmd.extend(gpu_args)
-        
-        # 输入文件 - 使用安全路径
-        safe_input_file = self._make_safe_path(input_file)
-        cmd.extend(["-i", safe_input_file])
+        gpu_args = self._get_gpu_args(gpu_mode)
         
         # 字幕滤镜 - 使用安全路径，并转义特殊字符
         safe_subtitle_file = self._make_safe_path(subtitle_file)
-        # 对于字幕文件路径，需要特殊处理反斜杠和单引号
-        escaped_subtitle_path = safe_subtitle_file.replace("\\", "/").replace("'", "\\'")
-        subtitle_filter = f"subtitles='{escaped_subtitle_path}':force_style='FontSize={font_size},PrimaryColour=&H{self._color_to_hex(font_color)}'"
-        cmd.extend(["-vf", subtitle_filter])
+        escaped_subtitle_path = self._escape_subtitle_path(safe_subtitle_file)
+        subtitle_filter = _SUBTITLE_FILTER_TEMPLATE.format(
+            path=escaped_subtitle_path,
+            style=self._get_force_style(font_size, font_color)
+        )
         
         # 编码器设置
-        video_encoder = self.gpu_detector.get_gpu_encoder(gpu_mode, "h264")
-        if video_encoder:
-            cmd.extend(["-c:v", video_encoder])
-        else:
-            cmd.extend(["-c:v", "libx264"])
-        
-        # 音频编码
-        cmd.extend(["-c:a", "copy"])
+        video_encoder = self._get_video_encoder(gpu_mode, "h264")
         
-        # 输出文件 - 使用安全路径
+        # 输入输出文件 - 使用安全路径
+        safe_input_file = self._make_safe_path(input_file)
         safe_output_file = self._make_safe_path(output_file)
-        cmd.append(safe_output_file)
         
-        return cmd
+        return [
+            self.ffmpeg_path, *gpu_args,
+            "-i", safe_input_file,
+            "-vf", subtitle_filter,
+            "-c:v", video_encoder,
+            *_AUDIO_COPY,
+            safe_output_file
+        ]
+    
+    def _escape_subtitle_path(self, subtitle_path: str) -> str:
+        """
+        转义字幕滤镜中的文件路径（按路径缓存）
+        
+        Args:
+            subtitle_path: 字幕文件路径
+            
+        Returns:
+            转义后的路径
+        """
+        escaped = self._escaped_subtitle_cache.get(subtitle_path)
+        if escaped is None:
+            # 先按选项值转义，再按滤镜图转义，路径中的 : ' , 等字符都能原样传给FFmpeg
+            escaped = subtitle_path.translate(_SUBTITLE_OPTION_ESCAPES).translate(_FILTERGRAPH_ESCAPES)
+            self._escaped_subtitle_cache[subtitle_path] = escaped
+        return escaped
+    
+    def _get_force_style(self, font_size: int, font_color: str) -> str:
+        """
+        获取字幕force_style参数片段（按样式缓存）
+        
+        Args:
+            font_size: 字体大小
+            font_color: 字体颜色
+            
+        Returns:
+            force_style参数内容
+        """
+        key = (font_size, font_color.lower())
+        style = self._style_cache.get(key)
+        if style is None:
+            style = _FORCE_STYLE_TEMPLATE.format(size=font_size, color=_COLOR_HEX.get(key[1], "FFFFFF"))
+            self._style_cache[key] = style
+        return style
+    
+    def _get_gpu_args(self, gpu_mode: str) -> Tuple[str, ...]:
+        """
+        获取GPU加速参数（按模式缓存）
+        
+        Args:
+            gpu_mode: GPU模式 (cuda, amd, cpu)
+            
+        Returns:
+            GPU加速参数元组
+        """
+        gpu_args = self._gpu_args_cache.get(gpu_mode)
+        if gpu_args is None:
+            gpu_args = tuple(self.gpu_detector.get_gpu_acceleration_args(gpu_mode, advanced=True))
+            self._gpu_args_cache[gpu_mode] = gpu_args
+        return gpu_args
+    
+    def _get_video_encoder(self, gpu_mode: str, codec: str) -> str:
+        """
+        获取视频编码器名称（按模式和编码格式缓存）
+        
+        Args:
+            gpu_mode: GPU模式 (cuda, amd, cpu)
+            codec: 编码格式 (h264, hevc)
+            
+        Returns:
+            编码器名称，GPU编码器不可用时返回软件编码器
+        """
+        key = (gpu_mode, codec)
+        encoder = self._encoder_cache.get(key)
+        if encoder is None:
+            encoder = self.gpu_detector.get_gpu_encoder(gpu_mode, codec) or _SOFTWARE_ENCODERS.get(codec, "libx264")
+            self._encoder_cache[key] = encoder
+        return encoder
     
-    def _get_quality_settings(self, quality: str, gpu_mode: str) -> List[str]:
+    def _invalidate_gpu_caches(self) -> None:
+        """GPU支持情况变化后清空相关缓存"""
+        self._gpu_args_cache.clear()
+        self._encoder_cache.clear()
+    
+    def _get_quality_settings(self, quality: str, video_encoder: str) -> Tuple[str, ...]:
         """
         获取质量设置参数
         
+        按实际使用的编码器选择码率控制方式，GPU编码器不可用而回退到
+        软件编码器时也能得到有效的参数
+        
         Args:
             quality: 质量等级 (low, medium, high)
-            gpu_mode: GPU模式
+            video_encoder: 视频编码器名称
             
         Returns:
-            质量参数列表
-        """
-        if gpu_mode == "cuda":
-            # NVIDIA GPU编码器质量设置 - 使用比特率控制获得更好效果
-            quality_map = {
-                "low": ["-preset", "fast", "-b:v", "3M"],
-                "medium": ["-preset", "medium", "-b:v", "5M"], 
-                "high": ["-preset", "slow", "-b:v", "8M"]
-            }
-        elif gpu_mode == "amd":
-            # AMD GPU编码器质量设置
-            quality_map = {
-                "low": ["-b:v", "3M"],
-                "medium": ["-b:v", "5M"],
-                "high": ["-b:v", "8M"]
-            }
-        else:
-            # CPU编码器质量设置 - 使用CRF获得更好的压缩效率
-            quality_map = {
-                "low": ["-preset", "fast", "-crf", "28"],
-                "medium": ["-preset", "medium", "-crf", "23"],
-                "high": ["-preset", "slow", "-crf", "18"]
-            }
-        
+            质量参数元组
+        """
+        family = video_encoder.rpartition('_')[2]
+        if family == "nvenc" and not _supports_nvenc_p_presets(self.version):
+            family = "nvenc_legacy"
+        quality_map = _QUALITY_SETTINGS.get(family, _QUALITY_SETTINGS["cpu"])
         return quality_map.get(quality, quality_map["medium"])
     
     def _color_to_hex(self, color_name: str) -> str:
@@ -459,17 +1001,26 @@ class FFmpegManager:
         Returns:
             十六进制颜色值
         """
-        color_map = {
-            "white": "FFFFFF",
-            "black": "000000",
-            "red": "FF0000",
-            "green": "00FF00",
-            "blue": "0000FF",
-            "yellow": "FFFF00",
-            "cyan": "00FFFF",
-            "magenta": "FF00FF"
-        }
-        return color_map.get(color_name.lower(), "FFFFFF")
+        return _COLOR_HEX.get(color_name.lower(), "FFFFFF")
+    
+    def get_cut_output_extension(self, input_file: str, reencode: bool = True) -> str:
+        """
+        获取切片输出文件的扩展名
+        
+        重新编码时输出mp4；流复制时保留输入的容器格式，
+        wmv、flv等的编码和mkv中的字幕流mp4无法容纳
+        
+        Args:
+            input_file: 输入文件路径
+            reencode: 是否重新编码
+            
+        Returns:
+            带点的小写扩展名
+        """
+        if reencode:
+            return ".mp4"
+        ext = os.path.splitext(input_file)[1].lower()
+        return ext if ext in _VIDEO_EXTS else ".mp4"
     
     def is_supported_video_format(self, file_path: str) -> bool:
         """
@@ -481,8 +1032,7 @@ class FFmpegManager:
         Returns:
             是否支持
         """
-        ext = os.path.splitext(file_path)[1].lower()
-        return ext in self.supported_formats['video']
+        return os.path.splitext(file_path)[1].lower() in _VIDEO_EXTS
     
     def is_supported_subtitle_format(self, file_path: str) -> bool:
         """
@@ -494,8 +1044,7 @@ class FFmpegManager:
         Returns:
             是否支持
         """
-        ext = os.path.splitext(file_path)[1].lower()
-        return ext in self.supported_formats['subtitle']
+        return os.path.splitext(file_path)[1].lower() in _SUB_EXTS
     
     def validate_time_format(self, time_str: str) -> bool:
         """
@@ -507,8 +1056,31 @@ class FFmpegManager:
         Returns:
             格式是否正确
         """
-        pattern = r'^([0-1]?[0-9]|2[0-3]):([0-5]?[0-9]):([0-5]?[0-9])$'
-        return bool(re.match(pattern, time_str))
+        return self._parse_hms(time_str) is not None
+    
+    def _parse_hms(self, time_str: str) -> Optional[Tuple[int, int, int]]:
+        """
+        解析时间字符串为时、分、秒
+        
+        Args:
+            time_str: 时间字符串 (HH:MM:SS，每段1-2位数字，小时0-23)
+            
+        Returns:
+            (时, 分, 秒) 元组，格式无效时返回None
+        """
+        parts = time_str.split(':')
+        if len(parts) != 3:
+            return None
+        
+        for part in parts:
+            if not (0 < len(part) <= 2 and part.isascii() and part.isdigit()):
+                return None
+        
+        hours, minutes, seconds = int(parts[0]), int(parts[1]), int(parts[2])
+        if hours > 23 or minutes > 59 or seconds > 59:
+            return None
+        
+        return hours, minutes, seconds
     
     def time_to_seconds(self, time_str: str) -> int:
         """
@@ -520,14 +1092,11 @@ class FFmpegManager:
         Returns:
             秒数
         """
-        if not self.validate_time_format(time_str):
+        hms = self._parse_hms(time_str)
+        if hms is None:
             raise ValueError(f"无效的时间格式: {time_str}")
         
-        parts = time_str.split(':')
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds = int(parts[2])
-        
+        hours, minutes, seconds = hms
         return hours * 3600 + minutes * 60 + seconds
     
     def get_ffmpeg_info(self) -> Dict[str, any]:
@@ -540,8 +1109,8 @@ class FFmpegManager:
         if not self.is_valid:
             return {"valid": False, "message": "FFmpeg路径无效或未设置"}
         
-        # 获取GPU支持信息
-        gpu_support = self.gpu_detector.check_ffmpeg_gpu_support(self.ffmpeg_path)
+        # GPU支持信息已在set_ffmpeg_path中检测，直接复用结果
+        gpu_support = dict(self.gpu_detector.ffmpeg_gpu_support)
         
         return {
             "valid": True,
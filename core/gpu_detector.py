@@ -2,13 +2,59 @@
 GPU检测模块
 检测系统中可用的GPU并确定FFmpeg硬件加速支持
 """
+import os
 import subprocess
 import platform
 import re
+import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 
+# GPU名称关键字到厂商的映射（按优先级排列：NVIDIA > AMD > Intel）
+_VENDOR_KEYWORDS = {
+    'nvidia': 'nvidia',
+    'geforce': 'nvidia',
+    'quadro': 'nvidia',
+    'tesla': 'nvidia',
+    'amd': 'amd',
+    'radeon': 'amd',
+    'rx ': 'amd',
+    'vega': 'amd',
+    'intel': 'intel',
+    'uhd': 'intel',
+    'iris': 'intel'
+}
+
+# 所有模式共用的基本优化参数（覆盖输出、不做帧率同步）
+_BASE_ARGS = ("-y", "-vsync", "0")
+
+# 完整检测结果缓存，所有检测器实例共享：
+# (FFmpeg绝对路径, 修改时间) -> (GPU信息列表, GPU加速支持情况)
+_DETECTION_CACHE: Dict[Tuple[str, int], Tuple[Tuple["GPUInfo", ...], Dict[str, bool]]] = {}
+
+# FFmpeg本身的GPU加速支持情况只取决于可执行文件，单独缓存，可由持久化的结果预填：
+# (FFmpeg绝对路径, 修改时间) -> GPU加速支持情况
+_FFMPEG_SUPPORT_CACHE: Dict[Tuple[str, int], Dict[str, bool]] = {}
+
+
+def _ffmpeg_cache_key(ffmpeg_path: str) -> Optional[Tuple[str, int]]:
+    """
+    生成FFmpeg可执行文件的缓存键
+    
+    Args:
+        ffmpeg_path: FFmpeg可执行文件路径
+        
+    Returns:
+        (绝对路径, 修改时间)，文件无法访问时返回None
+    """
+    try:
+        return os.path.abspath(ffmpeg_path), os.stat(ffmpeg_path).st_mtime_ns
+    except OSError:
+        return None
+
+
 @dataclass
 class GPUInfo:
     """GPU信息数据类"""
@@ -32,6 +78,11 @@ class GPUDetector:
             "dxva2": False,
             "d3d11va": False
         }
+        # GPU模式查找表，根据检测结果预先计算，构建命令时只需一次字典查找
+        # (模式, 是否高级参数) -> 加速参数；模式 -> 编码器后缀
+        self._accel_args_table: Dict[Tuple[str, bool], Tuple[str, ...]] = {}
+        self._encoder_suffix_table: Dict[str, str] = {}
+        self._rebuild_mode_table()
     
     def detect_gpus(self) -> List[GPUInfo]:
         """
@@ -57,51 +108,39 @@ class GPUDetector:
     def _detect_gpus_windows(self) -> None:
         """检测Windows系统中的GPU"""
         try:
-            # 使用wmic命令检测显卡
+            # 使用单次PowerShell CIM查询获取结构化的显卡信息（wmic已被弃用）
             cmd = [
-                "wmic", "path", "win32_VideoController",
-                "get", "name,AdapterRAM,DriverVersion", "/format:csv"
+                "powershell", "-NoProfile", "-Command",
+                "Get-CimInstance Win32_VideoController | "
+                "Select-Object Name,AdapterRAM,DriverVersion | ConvertTo-Json"
             ]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=10, encoding='utf-8', errors='ignore')
             
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                for line in lines[1:]:  # 跳过标题行
-                    if line.strip():
-                        parts = line.split(',')
-                        if len(parts) >= 4:
-                            # 修复: 在Windows wmic输出中，驱动名称可能包含实际的GPU名称
-                            name = parts[2].strip()
-                            memory = parts[1].strip() if parts[1].strip() else None
-                            driver = parts[3].strip() if parts[3].strip() else None
-                            
-                            # 如果name不是真正的GPU名称，尝试从driver字段获取
-                            if name and name != "Name":
-                                # 检查name是否看起来像版本号而不是GPU名称
-                                if name.replace('.', '').replace('_', '').isdigit():
-                                    # name看起来像版本号，使用driver作为GPU名称
-                                    if driver and any(keyword in driver.lower() for keyword in ['nvidia', 'geforce', 'radeon', 'amd', 'intel']):
-                                        actual_name = driver
-                                        vendor = self._get_vendor_from_name(driver)
-                                    else:
-                                        actual_name = name
-                                        vendor = "unknown"
-                                else:
-                                    actual_name = name
-                                    vendor = self._get_vendor_from_name(name)
-                                
-                                gpu_info = GPUInfo(
-                                    name=actual_name,
-                                    vendor=vendor,
-                                    memory=self._format_memory(memory),
-                                    driver_version=driver if driver != actual_name else None
-                                )
-                                self.available_gpus.append(gpu_info)
+            if result.returncode != 0 or not result.stdout.strip():
+                raise RuntimeError(result.stderr.strip() or "PowerShell查询失败")
+            
+            controllers = json.loads(result.stdout)
+            # 只有一块显卡时ConvertTo-Json输出单个对象而不是数组
+            if isinstance(controllers, dict):
+                controllers = [controllers]
+            
+            for controller in controllers:
+                name = (controller.get("Name") or "").strip()
+                if not name:
+                    continue
+                
+                memory = controller.get("AdapterRAM")
+                gpu_info = GPUInfo(
+                    name=name,
+                    vendor=self._get_vendor_from_name(name),
+                    memory=self._format_memory(str(memory) if memory is not None else None),
+                    driver_version=controller.get("DriverVersion") or None
+                )
+                self.available_gpus.append(gpu_info)
         except Exception as e:
             print(f"Windows GPU检测失败: {e}")
-            # 备选方案：尝试检测NVIDIA和AMD GPU
+            # 备选方案：尝试使用nvidia-smi检测NVIDIA GPU
             self._detect_nvidia_gpu_fallback()
-            self._detect_amd_gpu_fallback()
     
     def _detect_gpus_linux(self) -> None:
         """检测Linux系统中的GPU"""
@@ -157,43 +196,13 @@ class GPUDetector:
         except (subprocess.CalledProcessError, FileNotFoundError):
             pass  # nvidia-smi不可用
     
-    def _detect_amd_gpu_fallback(self) -> None:
-        """备选方案：检测AMD GPU"""
-        try:
-            # 在Windows上尝试检测AMD GPU
-            if self.system == "windows":
-                result = subprocess.run(
-                    ["wmic", "path", "win32_VideoController", 
-                     "where", "name like '%AMD%' or name like '%Radeon%'",
-                     "get", "name", "/format:list"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                    encoding='utf-8',
-                    errors='ignore'
-                )
-                
-                if result.returncode == 0:
-                    lines = result.stdout.split('\n')
-                    for line in lines:
-                        if line.startswith('Name=') and ('AMD' in line or 'Radeon' in line):
-                            name = line.split('=', 1)[1].strip()
-                            gpu_info = GPUInfo(name=name, vendor="amd")
-                            self.available_gpus.append(gpu_info)
-        except Exception:
-            pass
-    
     def _get_vendor_from_name(self, name: str) -> str:
         """从GPU名称推断厂商"""
         name_lower = name.lower()
-        if any(keyword in name_lower for keyword in ['nvidia', 'geforce', 'quadro', 'tesla']):
-            return "nvidia"
-        elif any(keyword in name_lower for keyword in ['amd', 'radeon', 'rx ', 'vega']):
-            return "amd"
-        elif any(keyword in name_lower for keyword in ['intel', 'uhd', 'iris']):
-            return "intel"
-        else:
-            return "unknown"
+        for keyword, vendor in _VENDOR_KEYWORDS.items():
+            if keyword in name_lower:
+                return vendor
+        return "unknown"
     
     def _format_memory(self, memory_str: Optional[str]) -> Optional[str]:
         """格式化显存大小"""
@@ -210,10 +219,49 @@ class GPUDetector:
         
         return memory_str
     
+    def detect_all(self, ffmpeg_path: str) -> Tuple[List[GPUInfo], Dict[str, bool]]:
+        """
+        并行检测系统GPU和FFmpeg的GPU加速支持
+        
+        系统显卡查询与FFmpeg能力查询互不依赖，并发执行后总耗时取决于较慢的一个。
+        结果以 (绝对路径, 修改时间) 为键缓存，同一FFmpeg再次检测时不再启动子进程，
+        可执行文件被替换后会重新检测
+        
+        Args:
+            ffmpeg_path: FFmpeg可执行文件路径
+            
+        Returns:
+            (GPU信息列表, 各种GPU加速的支持情况)
+        """
+        if not ffmpeg_path:
+            return self.detect_gpus(), self.ffmpeg_gpu_support
+        
+        cache_key = _ffmpeg_cache_key(ffmpeg_path)
+        cached = _DETECTION_CACHE.get(cache_key) if cache_key else None
+        if cached is not None:
+            gpus, support = cached
+            self.available_gpus = list(gpus)
+            # 原地更新，保持调用方持有的支持情况字典引用有效
+            self.ffmpeg_gpu_support.update(support)
+            self._rebuild_mode_table()
+            return self.available_gpus, self.ffmpeg_gpu_support
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            gpus_future = executor.submit(self.detect_gpus)
+            support_future = executor.submit(self.check_ffmpeg_gpu_support, ffmpeg_path)
+            gpus, support = gpus_future.result(), support_future.result()
+        
+        if cache_key:
+            _DETECTION_CACHE[cache_key] = (tuple(gpus), dict(support))
+        return gpus, support
+    
     def check_ffmpeg_gpu_support(self, ffmpeg_path: str) -> Dict[str, bool]:
         """
         检查FFmpeg的GPU加速支持
         
+        并行查询 -hwaccels 和 -encoders；不使用 -buildconf，nvenc、cuda、dxva2等
+        通常由configure自动检测而不出现在编译选项中，无法据此判断
+        
         Args:
             ffmpeg_path: FFmpeg可执行文件路径
             
@@ -223,29 +271,100 @@ class GPUDetector:
         if not ffmpeg_path:
             return self.ffmpeg_gpu_support
         
-        try:
-            # 获取FFmpeg编译信息
-            result = subprocess.run(
-                [ffmpeg_path, "-hwaccels"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                encoding='utf-8',
-                errors='ignore'
-            )
+        cache_key = _ffmpeg_cache_key(ffmpeg_path)
+        cached = _FFMPEG_SUPPORT_CACHE.get(cache_key) if cache_key else None
+        if cached is not None:
+            self.ffmpeg_gpu_support.update(cached)
+            self._rebuild_mode_table()
+            return self.ffmpeg_gpu_support
+        
+        # 并行查询硬件加速器和编码器列表
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hwaccels_future = executor.submit(self._run_ffmpeg, ffmpeg_path, "-hwaccels")
+            encoders_future = executor.submit(self._run_ffmpeg, ffmpeg_path, "-encoders")
+            self._parse_hwaccels(hwaccels_future.result())
+            self._parse_encoders(encoders_future.result())
+        
+        if cache_key:
+            _FFMPEG_SUPPORT_CACHE[cache_key] = dict(self.ffmpeg_gpu_support)
+        self._rebuild_mode_table()
+        return self.ffmpeg_gpu_support
+    
+    @staticmethod
+    def get_cached_ffmpeg_support(ffmpeg_path: str) -> Optional[Dict[str, bool]]:
+        """
+        获取当前FFmpeg可执行文件已缓存的GPU加速支持情况
+        
+        Args:
+            ffmpeg_path: FFmpeg可执行文件路径
             
-            if result.returncode == 0:
-                output = result.stdout.lower()
-                
-                # 检查硬件加速器支持
-                self.ffmpeg_gpu_support["cuda"] = "cuda" in output
-                self.ffmpeg_gpu_support["opencl"] = "opencl" in output
-                self.ffmpeg_gpu_support["dxva2"] = "dxva2" in output
-                self.ffmpeg_gpu_support["d3d11va"] = "d3d11va" in output
+        Returns:
+            支持情况的副本，尚未检测或文件已变化时返回None
+        """
+        cache_key = _ffmpeg_cache_key(ffmpeg_path)
+        cached = _FFMPEG_SUPPORT_CACHE.get(cache_key) if cache_key else None
+        return dict(cached) if cached is not None else None
+    
+    @staticmethod
+    def prime_ffmpeg_support(ffmpeg_path: str, mtime_ns: int, support: Dict[str, bool]) -> None:
+        """
+        用之前保存的检测结果预填GPU加速支持缓存
+        
+        修改时间与可执行文件当前的不一致时，缓存键不会被命中，结果自然失效
+        
+        Args:
+            ffmpeg_path: FFmpeg可执行文件路径
+            mtime_ns: 保存结果时可执行文件的修改时间（纳秒）
+            support: 保存的GPU加速支持情况
+        """
+        cache_key = (os.path.abspath(ffmpeg_path), mtime_ns)
+        _FFMPEG_SUPPORT_CACHE.setdefault(cache_key, {name: bool(value) for name, value in support.items()})
+    
+    def _rebuild_mode_table(self) -> None:
+        """根据当前的GPU支持情况重新计算各GPU模式的加速参数和编码器"""
+        support = self.ffmpeg_gpu_support
+        table: Dict[Tuple[str, bool], Tuple[str, ...]] = {}
+        
+        if support.get("cuda", False):
+            # 高级CUDA参数：更好的性能和兼容性
+            table[("cuda", True)] = _BASE_ARGS + ("-hwaccel", "cuda", "-hwaccel_output_format", "cuda")
+            table[("cuda", False)] = ("-hwaccel", "cuda")
+        
+        windows_dxva2 = self.system == "windows" and support.get("dxva2", False)
+        opencl = support.get("opencl", False)
+        # 高级AMD参数优先使用DXVA2，基础参数优先使用OpenCL
+        if windows_dxva2:
+            table[("amd", True)] = _BASE_ARGS + ("-hwaccel", "dxva2")
+        elif opencl:
+            table[("amd", True)] = _BASE_ARGS + ("-hwaccel", "opencl")
+        if opencl:
+            table[("amd", False)] = ("-hwaccel", "opencl")
+        elif windows_dxva2:
+            table[("amd", False)] = ("-hwaccel", "dxva2")
+        
+        suffixes: Dict[str, str] = {}
+        if support.get("nvenc", False):
+            suffixes["cuda"] = "nvenc"
+        if support.get("amf", False):
+            suffixes["amd"] = "amf"
+        
+        self._accel_args_table = table
+        self._encoder_suffix_table = suffixes
+    
+    def _run_ffmpeg(self, ffmpeg_path: str, option: str) -> Optional[str]:
+        """
+        运行FFmpeg查询命令
+        
+        Args:
+            ffmpeg_path: FFmpeg可执行文件路径
+            option: 查询参数 (如 -hwaccels, -encoders)
             
-            # 检查编码器支持
+        Returns:
+            小写的标准输出，失败时返回None
+        """
+        try:
             result = subprocess.run(
-                [ffmpeg_path, "-encoders"],
+                [ffmpeg_path, option],
                 capture_output=True,
                 text=True,
                 timeout=10,
@@ -254,24 +373,50 @@ class GPUDetector:
             )
             
             if result.returncode == 0:
-                output = result.stdout.lower()
-                
-                # 检查NVIDIA编码器
-                self.ffmpeg_gpu_support["nvenc"] = any(
-                    encoder in output for encoder in 
-                    ["h264_nvenc", "hevc_nvenc", "av1_nvenc"]
-                )
-                
-                # 检查AMD编码器
-                self.ffmpeg_gpu_support["amf"] = any(
-                    encoder in output for encoder in 
-                    ["h264_amf", "hevc_amf", "av1_amf"]
-                )
+                return result.stdout.lower()
         
         except Exception as e:
             print(f"FFmpeg GPU支持检查失败: {e}")
         
-        return self.ffmpeg_gpu_support
+        return None
+    
+    def _parse_hwaccels(self, output: Optional[str]) -> None:
+        """
+        解析-hwaccels输出，更新硬件加速器支持情况
+        
+        Args:
+            output: 小写的-hwaccels输出
+        """
+        if output is None:
+            return
+        
+        # 检查硬件加速器支持
+        self.ffmpeg_gpu_support["cuda"] = "cuda" in output
+        self.ffmpeg_gpu_support["opencl"] = "opencl" in output
+        self.ffmpeg_gpu_support["dxva2"] = "dxva2" in output
+        self.ffmpeg_gpu_support["d3d11va"] = "d3d11va" in output
+    
+    def _parse_encoders(self, output: Optional[str]) -> None:
+        """
+        解析-encoders输出，更新GPU编码器支持情况
+        
+        Args:
+            output: 小写的-encoders输出
+        """
+        if output is None:
+            return
+        
+        # 检查NVIDIA编码器
+        self.ffmpeg_gpu_support["nvenc"] = any(
+            encoder in output for encoder in 
+            ["h264_nvenc", "hevc_nvenc", "av1_nvenc"]
+        )
+        
+        # 检查AMD编码器
+        self.ffmpeg_gpu_support["amf"] = any(
+            encoder in output for encoder in 
+            ["h264_amf", "hevc_amf", "av1_amf"]
+        )
     
     def get_recommended_gpu_mode(self) -> str:
         """
@@ -303,34 +448,11 @@ class GPUDetector:
         Returns:
             FFmpeg参数列表
         """
-        if mode == "cuda" and self.ffmpeg_gpu_support.get("cuda", False):
-            if advanced:
-                # 高级CUDA参数：更好的性能和兼容性
-                return ["-y", "-vsync", "0", "-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
-            else:
-                return ["-hwaccel", "cuda"]
-                
-        elif mode == "amd":
-            if advanced:
-                # 高级AMD参数
-                if self.system == "windows" and self.ffmpeg_gpu_support.get("dxva2", False):
-                    return ["-y", "-vsync", "0", "-hwaccel", "dxva2"]
-                elif self.ffmpeg_gpu_support.get("opencl", False):
-                    return ["-y", "-vsync", "0", "-hwaccel", "opencl"]
-                else:
-                    return ["-y", "-vsync", "0"]  # 基本优化参数
-            else:
-                # 基础AMD参数
-                if self.ffmpeg_gpu_support.get("opencl", False):
-                    return ["-hwaccel", "opencl"]
-                elif self.system == "windows" and self.ffmpeg_gpu_support.get("dxva2", False):
-                    return ["-hwaccel", "dxva2"]
-        
-        elif advanced:
-            # CPU模式但使用基本优化
-            return ["-y", "-vsync", "0"]
-        
-        return []  # CPU模式无优化
+        args = self._accel_args_table.get((mode, advanced))
+        if args is None:
+            # 模式不可用或为CPU模式：高级模式下仍使用基本优化参数
+            args = _BASE_ARGS if advanced else ()
+        return list(args)
     
     def get_gpu_encoder(self, mode: str, codec: str = "h264") -> Optional[str]:
         """
@@ -343,12 +465,10 @@ class GPUDetector:
         Returns:
             编码器名称
         """
-        if mode == "cuda" and self.ffmpeg_gpu_support.get("nvenc", False):
-            return f"{codec}_nvenc"
-        elif mode == "amd" and self.ffmpeg_gpu_support.get("amf", False):
-            return f"{codec}_amf"
-        
-        return None  # 使用软件编码器
+        suffix = self._encoder_suffix_table.get(mode)
+        if suffix is None:
+            return None  # 使用软件编码器
+        return f"{codec}_{suffix}"
     
     def get_gpu_summary(self) -> Dict[str, any]:
         """
@@ -2,15 +2,49 @@
 视频处理模块
 负责执行FFmpeg命令和监控处理进度
 """
+import os
 import subprocess
 import threading
+import selectors
 import re
 import time
-from typing import Optional, Callable, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, Callable, Dict, Any, Iterator, Tuple, List
 from enum import Enum
 
 
+# 进度解析直接作用于stderr原始字节，无需逐行解码
+# 预编译的错误关键字正则，忽略大小写，无需先转换整行
+_ERROR_RE = re.compile(rb'error|failed|invalid|could not', re.IGNORECASE)
+
+# 从错误输出中提取错误详情（关键字之后第一个冒号后的内容）
+_ERROR_DETAIL_RE = re.compile(r'(?:Error|Invalid|Could not|Failed|Unable).*?:(.+)', re.IGNORECASE)
+
+# 进度字段的融合正则，一次扫描提取所有字段（组名即字段名）
+_PROGRESS_RE = re.compile(
+    rb'frame=\s*(?P<frame>\d+)'
+    rb'|fps=\s*(?P<fps>[0-9.]+)'
+    rb'|time=(?P<time>\d{1,2}:\d{2}:\d{2}(?:\.\d{2})?|N/A)'
+    rb'|bitrate=\s*(?P<bitrate>[0-9.]+k?bits/s)'
+    rb'|speed=\s*(?P<speed>[0-9.]+(?=x)|N/A)'
+)
+
+# FFmpeg的进度行以\r结尾，普通日志行以\n结尾，二者都作为行分隔符
+_LINE_SPLIT_RE = re.compile(rb'[\r\n]+')
+
+# 每次从stderr读取的最大字节数
+_READ_CHUNK_SIZE = 65536
+
+# 未完成行的最大长度，超过后丢弃，防止异常输出无限占用内存
+_MAX_PENDING_LINE = 1 << 20
+
+# Windows上select无法用于管道，多个处理器共享监控线程仅在其他平台启用
+_SHARED_MONITOR_SUPPORTED = os.name != 'nt'
+
+# 进度回调的最小时间间隔（秒）和最小百分比变化，超过其一才通知界面
+_PROGRESS_CALLBACK_INTERVAL = 0.1
+_PROGRESS_CALLBACK_STEP = 0.1
+
+
 class ProcessStatus(Enum):
     """处理状态枚举"""
     IDLE = "idle"
@@ -20,22 +54,61 @@ class ProcessStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
 class ProcessProgress:
-    """处理进度数据类"""
-    percentage: float = 0.0
-    time_processed: str = "00:00:00"
-    speed: str = "0x"
-    bitrate: str = "0 kbits/s"
-    fps: float = 0.0
-    eta: str = "unknown"
-    current_frame: int = 0
-    total_frames: int = 0
+    """处理进度数据类（使用__slots__，进度解析时频繁读写属性）"""
+    
+    __slots__ = (
+        'percentage', 'time_processed', 'speed', 'bitrate',
+        'fps', 'eta', 'current_frame', 'total_frames', 'speed_value',
+        'time_processed_sec'
+    )
+    
+    def __init__(self,
+                 percentage: float = 0.0,
+                 time_processed: str = "00:00:00",
+                 speed: str = "0x",
+                 bitrate: str = "0 kbits/s",
+                 fps: float = 0.0,
+                 eta: str = "unknown",
+                 current_frame: int = 0,
+                 total_frames: int = 0,
+                 speed_value: float = 0.0,
+                 time_processed_sec: float = 0.0):
+        self.percentage = percentage
+        self.time_processed = time_processed
+        self.speed = speed
+        self.bitrate = bitrate
+        self.fps = fps
+        self.eta = eta
+        self.current_frame = current_frame
+        self.total_frames = total_frames
+        # 速度的数值形式（倍速），与speed同时更新，计算剩余时间时无需再解析字符串
+        self.speed_value = speed_value
+        # 已处理时长的数值形式（秒），time_processed只在需要显示时由它格式化
+        self.time_processed_sec = time_processed_sec
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"ProcessProgress({fields})"
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
 
 
 class VideoProcessor:
     """视频处理器"""
     
+    __slots__ = (
+        'process', 'status', 'progress', 'error_message',
+        'progress_callback', 'status_callback', 'current_task',
+        '_stop_event', '_monitor_thread',
+        '_last_callback_time', '_last_callback_percentage',
+        '_total_duration_seconds', '_finished_event', '_stderr_monitor',
+        '_status_version', '_status_info_cache', '_time_text_seconds'
+    )
+    
     def __init__(self):
         self.process: Optional[subprocess.Popen] = None
         self.status = ProcessStatus.IDLE
@@ -46,6 +119,21 @@ class VideoProcessor:
         self.current_task: str = ""
         self._stop_event = threading.Event()
         self._monitor_thread: Optional[threading.Thread] = None
+        # 上一次进度回调的时间和百分比，用于限制回调频率
+        self._last_callback_time = 0.0
+        self._last_callback_percentage = -1.0
+        # 总时长（秒），用于计算进度百分比，0表示未知
+        self._total_duration_seconds = 0.0
+        # 当前任务是否已处理完毕（未启动任务时视为已完成）
+        self._finished_event = threading.Event()
+        self._finished_event.set()
+        # 共享的stderr监控器，为None时每个任务使用独立的监控线程
+        self._stderr_monitor: Optional["_StderrMonitor"] = None
+        # 状态信息缓存：状态或进度每次变化时版本号加一，版本未变时直接返回缓存
+        self._status_version = 0
+        self._status_info_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        # progress.time_processed当前对应的秒数，与time_processed_sec不同时需要重新格式化
+        self._time_text_seconds = 0.0
         
     def set_progress_callback(self, callback: Callable[[ProcessProgress], None]) -> None:
         """
@@ -69,6 +157,38 @@ class VideoProcessor:
         """
         启动FFmpeg处理过程
         
+        Args:
+            command: FFmpeg命令列表
+            task_name: 任务名称
+            
+        Returns:
+            启动是否成功
+        """
+        if not self._launch_process(command, task_name):
+            return False
+        
+        # 启动监控：交给共享监控器，或启动独立的监控线程
+        if self._stderr_monitor is not None:
+            try:
+                self._stderr_monitor.register(self)
+            except RuntimeError as e:
+                # 监控器在进程启动期间被关闭：没有线程会回收进程，直接终止
+                self._terminate_process()
+                self._report_start_failure(f"启动失败: {e}")
+                return False
+        else:
+            self._monitor_thread = threading.Thread(
+                target=self._monitor_progress,
+                daemon=True
+            )
+            self._monitor_thread.start()
+        
+        return True
+    
+    def _launch_process(self, command: list, task_name: str) -> bool:
+        """
+        重置任务状态并启动FFmpeg进程（不启动监控）
+        
         Args:
             command: FFmpeg命令列表
             task_name: 任务名称
@@ -80,37 +200,37 @@ class VideoProcessor:
             print("已有任务正在运行")
             return False
         
+        # 共享监控器已关闭时不启动进程，否则进程无人监控和回收
+        if self._stderr_monitor is not None and self._stderr_monitor.closed:
+            self._report_start_failure("启动失败: stderr监控器已关闭")
+            return False
+        
         try:
             self.current_task = task_name
             self.status = ProcessStatus.RUNNING
             self.error_message = ""
             self.progress = ProcessProgress()
+            self._time_text_seconds = 0.0
             self._stop_event.clear()
+            self._last_callback_time = 0.0
+            self._last_callback_percentage = -1.0
+            self._finished_event.clear()
+            self._status_version += 1
             
             # 不使用-progress，直接从stderr读取进度信息
-            command_with_progress = command.copy()
-            # 移除可能存在的-nostats参数，我们需要stats来显示进度
-            if "-nostats" in command_with_progress:
-                command_with_progress.remove("-nostats")
+            # 移除可能存在的-nostats参数，我们需要stats来显示进度；没有时直接使用原命令
+            command_with_progress = command
+            if "-nostats" in command:
+                command_with_progress = [arg for arg in command if arg != "-nostats"]
             
             # 启动FFmpeg进程
             self.process = subprocess.Popen(
                 command_with_progress,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1,
-                encoding='utf-8',
-                errors='ignore'
+                bufsize=0
             )
             
-            # 启动监控线程
-            self._monitor_thread = threading.Thread(
-                target=self._monitor_progress,
-                daemon=True
-            )
-            self._monitor_thread.start()
-            
             # 通知状态变化
             if self.status_callback:
                 self.status_callback(self.status, f"开始{task_name}")
@@ -118,32 +238,58 @@ class VideoProcessor:
             return True
             
         except Exception as e:
-            self.status = ProcessStatus.ERROR
-            self.error_message = f"启动失败: {str(e)}"
-            if self.status_callback:
-                self.status_callback(self.status, self.error_message)
+            self._report_start_failure(f"启动失败: {str(e)}")
             return False
     
+    def _report_start_failure(self, message: str) -> None:
+        """
+        记录任务启动失败
+        
+        Args:
+            message: 错误信息
+        """
+        self.status = ProcessStatus.ERROR
+        self.error_message = message
+        self._status_version += 1
+        self._finished_event.set()
+        if self.status_callback:
+            self.status_callback(self.status, self.error_message)
+    
     def _monitor_progress(self) -> None:
         """监控处理进度"""
         if not self.process:
             return
         
         try:
-            # 读取进度信息（从stderr）
-            while self.process.poll() is None and not self._stop_event.is_set():
-                if self.process.stderr:
-                    line = self.process.stderr.readline()
-                    if line:
-                        line_stripped = line.strip()
-                        self._parse_progress_line(line_stripped)
-                
-                # 检查是否需要停止
-                if self._stop_event.is_set():
-                    self._terminate_process()
-                    break
-                
-                time.sleep(0.1)
+            # 读取进度信息（从stderr），阻塞读取直到进程关闭管道；
+            # 取消时stop_process会终止进程，读取随即返回EOF
+            handle_line = self._handle_stderr_line
+            for line in self._iter_stderr_lines(self.process.stderr):
+                handle_line(line)
+        except Exception as e:
+            self._report_monitor_error(e)
+            return
+        
+        self._finish_process()
+    
+    def _handle_stderr_line(self, line: bytes) -> None:
+        """
+        处理一行stderr输出（任务已取消时忽略）
+        
+        Args:
+            line: 输出行内容（原始字节）
+        """
+        if not self._stop_event.is_set():
+            self._parse_progress_line(line.strip())
+    
+    def _finish_process(self) -> None:
+        """stderr读取结束后回收进程，更新最终状态并触发最后一次进度回调"""
+        try:
+            # 检查是否需要停止，并回收进程
+            if self._stop_event.is_set():
+                self._terminate_process()
+            else:
+                self.process.wait()
             
             # 进程结束后的处理
             if not self._stop_event.is_set():
@@ -164,101 +310,165 @@ class VideoProcessor:
             
             # 最后一次进度回调
             if self.progress_callback:
+                self._refresh_time_text()
                 self.progress_callback(self.progress)
                 
         except Exception as e:
-            self.status = ProcessStatus.ERROR
-            self.error_message = f"监控进程出错: {str(e)}"
-            if self.status_callback:
-                self.status_callback(self.status, self.error_message)
+            self._report_monitor_error(e)
+        finally:
+            self._status_version += 1
+            self._finished_event.set()
+    
+    def _report_monitor_error(self, error: Exception) -> None:
+        """
+        记录监控过程中的异常
+        
+        Args:
+            error: 捕获的异常
+        """
+        self.status = ProcessStatus.ERROR
+        self.error_message = f"监控进程出错: {str(error)}"
+        self._status_version += 1
+        self._finished_event.set()
+        if self.status_callback:
+            self.status_callback(self.status, self.error_message)
     
-    def _parse_progress_line(self, line: str) -> None:
+    @staticmethod
+    def _split_stderr_lines(pending: bytes, chunk: bytes) -> Tuple[List[bytes], bytes]:
+        """
+        将新读取的stderr数据与上次剩余的不完整行拼接后分行
+        
+        进度行以\r结尾，按\r和\n同时分行，才能及时拿到每一行进度
+        
+        Args:
+            pending: 上次剩余的不完整行
+            chunk: 新读取的数据
+            
+        Returns:
+            (完整的行列表, 新的不完整行)
+        """
+        lines = _LINE_SPLIT_RE.split(pending + chunk)
+        # 最后一段可能是不完整的行，留到下次读取后再处理
+        pending = lines.pop()
+        if len(pending) > _MAX_PENDING_LINE:
+            pending = b''
+        return [line for line in lines if line], pending
+    
+    @staticmethod
+    def _iter_stderr_lines(stream) -> Iterator[bytes]:
+        """
+        按行读取FFmpeg的stderr原始字节
+        
+        Args:
+            stream: 无缓冲的stderr字节流
+            
+        Returns:
+            逐行产生的字节串（不含行分隔符）
+        """
+        pending = b''
+        while True:
+            chunk = stream.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            lines, pending = VideoProcessor._split_stderr_lines(pending, chunk)
+            yield from lines
+        if pending:
+            yield pending
+    
+    def _parse_progress_line(self, line: bytes) -> None:
         """
         解析FFmpeg进度输出行
         
         Args:
-            line: 输出行内容
+            line: 输出行内容（原始字节）
         """
         try:
-            # 检查是否是错误信息
-            if any(error_keyword in line.lower() for error_keyword in ['error', 'failed', 'invalid', 'could not']):
-                if not self.error_message:  # 只记录第一个错误
-                    self.error_message = line
-                return
-            
             # FFmpeg进度输出格式示例:
             # frame=  123 fps= 25 q=28.0 size=    1024kB time=00:00:05.00 bitrate=1677.7kbits/s speed=1.23x
             
-            # 只解析包含实际进度信息的行
-            if not any(keyword in line for keyword in ['frame=', 'time=', 'size=', 'bitrate=']):
+            # 先用子串查找快速筛选：非进度行只需检查是否为错误信息，
+            # 进度行只包含固定的统计字段，不会是错误信息
+            if not (b'frame=' in line or b'time=' in line or
+                    b'size=' in line or b'bitrate=' in line):
+                if not self.error_message and _ERROR_RE.search(line):
+                    self.error_message = line.decode('utf-8', 'ignore')  # 只记录第一个错误
+                    self._status_version += 1
                 return
             
-            # 解析时间进度 - 处理N/A和正常时间格式
-            if 'time=N/A' in line:
-                # 时间未知，不更新时间
-                pass
-            else:
-                time_match = re.search(r'time=(\d{1,2}:\d{2}:\d{2}(?:\.\d{2})?)', line)
-                if time_match:
-                    self.progress.time_processed = time_match.group(1)
-                    # 确保时间格式标准化
-                    if '.' not in self.progress.time_processed:
-                        self.progress.time_processed += '.00'
+            # 进度对象在本行内多次读写，绑定为局部变量
+            progress = self.progress
+            
+            # 一次扫描取出所有进度字段，同一字段只取第一次出现的值；
+            # 匹配到的内容都是ASCII，只解码这些片段
+            fields: Dict[str, str] = {}
+            for match in _PROGRESS_RE.finditer(line):
+                if match.lastgroup not in fields:
+                    fields[match.lastgroup] = match.group(match.lastgroup).decode('ascii')
+            
+            # 解析时间进度 - 时间为N/A时不更新；只保存秒数，显示字符串在回调前再生成
+            time_value = fields.get("time")
+            if time_value and time_value != "N/A":
+                hours, minutes, secs = time_value.split(':')
+                progress.time_processed_sec = int(hours) * 3600 + int(minutes) * 60 + float(secs)
             
             # 解析速度 - 处理N/A和正常速度
-            if 'speed=N/A' in line:
-                self.progress.speed = "N/A"
-            else:
-                speed_match = re.search(r'speed=\s*([0-9.]+)x', line)
-                if speed_match:
-                    self.progress.speed = f"{speed_match.group(1)}x"
+            speed_text = fields.get("speed")
+            if speed_text == "N/A":
+                progress.speed = speed_text
+                progress.speed_value = 0.0
+            elif speed_text:
+                progress.speed = f"{speed_text}x"
+                try:
+                    progress.speed_value = float(speed_text)
+                except ValueError:
+                    progress.speed_value = 0.0
             
             # 解析比特率 - 支持不同单位
-            bitrate_match = re.search(r'bitrate=\s*([0-9.]+)(k?bits/s)', line)
-            if bitrate_match:
-                value = bitrate_match.group(1)
-                unit = bitrate_match.group(2)
-                self.progress.bitrate = f"{value} {unit}"
+            bitrate_value = fields.get("bitrate")
+            if bitrate_value:
+                value = bitrate_value.rstrip("kbits/")
+                progress.bitrate = f"{value} {bitrate_value[len(value):]}"
             
             # 解析帧率
-            fps_match = re.search(r'fps=\s*([0-9.]+)', line)
-            if fps_match:
+            fps_value = fields.get("fps")
+            if fps_value:
                 try:
-                    self.progress.fps = float(fps_match.group(1))
+                    progress.fps = float(fps_value)
                 except ValueError:
                     pass
             
             # 解析当前帧数
-            frame_match = re.search(r'frame=\s*(\d+)', line)
-            if frame_match:
-                try:
-                    self.progress.current_frame = int(frame_match.group(1))
-                except ValueError:
-                    pass
+            frame_value = fields.get("frame")
+            if frame_value:
+                progress.current_frame = int(frame_value)
             
             # 计算百分比（需要总时长信息）
-            if (hasattr(self, '_total_duration_seconds') and 
-                self._total_duration_seconds > 0 and 
-                self.progress.time_processed):
+            total_seconds = self._total_duration_seconds
+            if total_seconds > 0:
                 
-                current_seconds = self._time_to_seconds(self.progress.time_processed)
+                current_seconds = progress.time_processed_sec
                 if current_seconds > 0:
-                    self.progress.percentage = min(100.0, (current_seconds / self._total_duration_seconds) * 100.0)
+                    progress.percentage = min(100.0, (current_seconds / total_seconds) * 100.0)
                     
                     # 计算预计剩余时间
-                    if self.progress.percentage > 0 and self.progress.speed:
-                        try:
-                            speed_value = float(self.progress.speed.replace('x', ''))
-                            if speed_value > 0:
-                                remaining_seconds = (self._total_duration_seconds - current_seconds) / speed_value
-                                self.progress.eta = self._seconds_to_time(int(remaining_seconds))
-                        except (ValueError, ZeroDivisionError):
-                            pass
-            
-            # 触发进度回调（只在有实际进度更新时）
+                    speed_value = progress.speed_value
+                    if progress.percentage > 0 and speed_value > 0:
+                        remaining_seconds = (total_seconds - current_seconds) / speed_value
+                        progress.eta = self._seconds_to_time(int(remaining_seconds))
+            
+            self._status_version += 1
+            
+            # 触发进度回调（只在有实际进度更新时），按时间间隔或百分比变化限频，
+            # 避免每一行输出都让界面线程重绘；进程结束时总会再回调一次
             if (self.progress_callback and 
-                (self.progress.time_processed or self.progress.current_frame > 0)):
-                self.progress_callback(self.progress)
+                (progress.time_processed or progress.current_frame > 0)):
+                now = time.monotonic()
+                if (now - self._last_callback_time >= _PROGRESS_CALLBACK_INTERVAL or
+                        progress.percentage - self._last_callback_percentage >= _PROGRESS_CALLBACK_STEP):
+                    self._last_callback_time = now
+                    self._last_callback_percentage = progress.percentage
+                    self._refresh_time_text()
+                    self.progress_callback(progress)
                 
         except Exception as e:
             # 不要因为解析错误而中断处理
@@ -293,11 +503,36 @@ class VideoProcessor:
         Returns:
             时间字符串 (HH:MM:SS)
         """
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
+        minutes, secs = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     
+    @staticmethod
+    def _format_progress_time(seconds: float) -> str:
+        """
+        将已处理秒数格式化为FFmpeg风格的时间字符串
+        
+        Args:
+            seconds: 秒数
+            
+        Returns:
+            时间字符串 (HH:MM:SS.ff)
+        """
+        # 按百分之一秒取整后用整数运算，避免浮点误差产生 "59.100" 之类的结果
+        total_centis = int(round(seconds * 100))
+        total_secs, centis = divmod(total_centis, 100)
+        minutes, secs = divmod(total_secs, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{centis:02d}"
+    
+    def _refresh_time_text(self) -> None:
+        """已处理秒数变化后，重新生成progress.time_processed显示字符串"""
+        progress = self.progress
+        seconds = progress.time_processed_sec
+        if seconds != self._time_text_seconds:
+            self._time_text_seconds = seconds
+            progress.time_processed = self._format_progress_time(seconds)
+    
     def _extract_error_message(self, error_output: str) -> str:
         """
         从错误输出中提取有用的错误信息
@@ -311,26 +546,13 @@ class VideoProcessor:
         if not error_output:
             return "未知错误"
         
-        # 常见错误模式
-        error_patterns = [
-            r"Error.*?:(.+)",
-            r"Invalid.*?:(.+)",
-            r"Could not.*?:(.+)",
-            r"Failed.*?:(.+)",
-            r"Unable.*?:(.+)"
-        ]
+        # 常见错误模式，一次扫描取最先出现的一处
+        match = _ERROR_DETAIL_RE.search(error_output)
+        if match:
+            return match.group(1).strip()
         
-        for pattern in error_patterns:
-            match = re.search(pattern, error_output, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        
-        # 如果没有匹配到特定模式，返回最后几行
-        lines = error_output.strip().split('\n')
-        if lines:
-            return lines[-1]
-        
-        return "处理失败"
+        # 如果没有匹配到特定模式，只取最后一行，无需拆分整个输出
+        return error_output.strip().rpartition('\n')[2]
     
     def set_total_duration(self, duration_str: str) -> None:
         """
@@ -342,7 +564,7 @@ class VideoProcessor:
         try:
             self._total_duration_seconds = self._time_to_seconds(duration_str)
         except:
-            self._total_duration_seconds = 0
+            self._total_duration_seconds = 0.0
     
     def stop_process(self) -> bool:
         """
@@ -357,6 +579,11 @@ class VideoProcessor:
         try:
             self._stop_event.set()
             self.status = ProcessStatus.CANCELLED
+            self._status_version += 1
+            
+            # 立即发送终止信号，使监控线程中阻塞的读取尽快结束
+            if self.process and self.process.poll() is None:
+                self.process.terminate()
             
             if self.status_callback:
                 self.status_callback(self.status, f"{self.current_task}已取消")
@@ -391,33 +618,43 @@ class VideoProcessor:
         Returns:
             是否在超时前完成
         """
-        if self._monitor_thread:
-            self._monitor_thread.join(timeout)
-            return not self._monitor_thread.is_alive()
-        return True
+        return self._finished_event.wait(timeout)
     
     def get_status_info(self) -> Dict[str, Any]:
         """
         获取当前状态信息
         
+        状态与进度未变化时返回上一次构建的同一字典，调用方不应修改它。
+        
         Returns:
             状态信息字典
         """
-        return {
+        # 先读版本号再构建：构建期间若有更新，版本号已变，下次调用会重新构建
+        version = self._status_version
+        cache = self._status_info_cache
+        if cache is not None and cache[0] == version:
+            return cache[1]
+        
+        self._refresh_time_text()
+        progress = self.progress
+        info = {
             "status": self.status.value,
             "task_name": self.current_task,
             "progress": {
-                "percentage": self.progress.percentage,
-                "time_processed": self.progress.time_processed,
-                "speed": self.progress.speed,
-                "bitrate": self.progress.bitrate,
-                "fps": self.progress.fps,
-                "eta": self.progress.eta,
-                "current_frame": self.progress.current_frame,
-                "total_frames": self.progress.total_frames
+                "percentage": progress.percentage,
+                "time_processed": progress.time_processed,
+                "speed": progress.speed,
+                "bitrate": progress.bitrate,
+                "fps": progress.fps,
+                "eta": progress.eta,
+                "current_frame": progress.current_frame,
+                "total_frames": progress.total_frames
             },
             "error_message": self.error_message
         }
+        # 单次引用赋值发布（版本号, 字典），读者不会看到不一致的组合
+        self._status_info_cache = (version, info)
+        return info
     
     def reset(self) -> None:
         """重置处理器状态"""
@@ -426,11 +663,124 @@ class VideoProcessor:
         
         self.status = ProcessStatus.IDLE
         self.progress = ProcessProgress()
+        self._time_text_seconds = 0.0
         self.error_message = ""
         self.current_task = ""
         self.process = None
-        if hasattr(self, '_total_duration_seconds'):
-            delattr(self, '_total_duration_seconds')
+        self._status_version += 1
+        self._total_duration_seconds = 0.0
+
+
+class _StderrMonitor:
+    """
+    共享的stderr监控器
+    
+    用一个线程通过selectors同时监听多个FFmpeg进程的stderr管道，
+    取代每个任务一个阻塞读取线程；新任务的注册请求经唤醒管道交给监控线程处理。
+    stderr结束后等待进程退出可能阻塞，回收工作交给单独的线程，不占用监控线程
+    """
+    
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._pending: List[VideoProcessor] = []
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # 唤醒管道：注册新任务或关闭时写入一个字节，让select立即返回
+        self._wake_read, self._wake_write = os.pipe()
+        self._selector.register(self._wake_read, selectors.EVENT_READ)
+    
+    def register(self, processor: VideoProcessor) -> None:
+        """
+        开始监听处理器当前进程的stderr
+        
+        Args:
+            processor: 已启动FFmpeg进程的处理器
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("stderr监控器已关闭")
+            self._pending.append(processor)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            os.write(self._wake_write, b'\0')
+    
+    @property
+    def closed(self) -> bool:
+        """监控器是否已关闭（关闭后不再接受新任务）"""
+        return self._closed
+    
+    def close(self) -> None:
+        """停止监控线程并关闭唤醒管道和选择器（仍在监听的任务不再更新进度）"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is not None:
+                # 由监控线程退出循环后自行释放资源
+                os.write(self._wake_write, b'\0')
+                return
+        self._release()
+    
+    def _release(self) -> None:
+        """关闭选择器和唤醒管道"""
+        with self._lock:
+            self._selector.close()
+            os.close(self._wake_read)
+            os.close(self._wake_write)
+    
+    def _run(self) -> None:
+        """监控线程主循环"""
+        try:
+            while not self._closed:
+                for key, _ in self._selector.select():
+                    if key.fileobj == self._wake_read:
+                        self._register_pending()
+                    else:
+                        self._read_stderr(key)
+        finally:
+            # 关闭时仍在监听的任务直接回收，等待者不会一直阻塞
+            for key in list(self._selector.get_map().values()):
+                if key.fileobj != self._wake_read:
+                    threading.Thread(target=key.data[0]._finish_process, daemon=True).start()
+            self._release()
+    
+    def _register_pending(self) -> None:
+        """处理排队的注册请求"""
+        os.read(self._wake_read, _READ_CHUNK_SIZE)
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for processor in pending:
+            # data保存 [处理器, 未完成的行]
+            self._selector.register(processor.process.stderr, selectors.EVENT_READ, [processor, b''])
+    
+    def _read_stderr(self, key: selectors.SelectorKey) -> None:
+        """
+        读取一个就绪的stderr管道，EOF时结束对应任务
+        
+        Args:
+            key: 就绪管道的注册信息
+        """
+        processor, pending = key.data
+        try:
+            chunk = os.read(key.fd, _READ_CHUNK_SIZE)
+            if chunk:
+                lines, key.data[1] = processor._split_stderr_lines(pending, chunk)
+                for line in lines:
+                    processor._handle_stderr_line(line)
+                return
+            
+            if pending:
+                processor._handle_stderr_line(pending)
+        except Exception as e:
+            self._selector.unregister(key.fileobj)
+            processor._report_monitor_error(e)
+            return
+        
+        self._selector.unregister(key.fileobj)
+        # 进程关闭stderr后不一定立即退出，等待和终止都在回收线程中进行
+        threading.Thread(target=processor._finish_process, daemon=True).start()
 
 
 class VideoProcessorManager:
@@ -439,6 +789,10 @@ class VideoProcessorManager:
     def __init__(self):
         self.processors: Dict[str, VideoProcessor] = {}
         self.active_processor: Optional[str] = None
+        # 所有处理器共享一个stderr监控线程（平台不支持时为None）
+        self._stderr_monitor: Optional[_StderrMonitor] = (
+            _StderrMonitor() if _SHARED_MONITOR_SUPPORTED else None
+        )
     
     def create_processor(self, name: str) -> VideoProcessor:
         """
@@ -451,6 +805,7 @@ class VideoProcessorManager:
             创建的处理器实例
         """
         processor = VideoProcessor()
+        processor._stderr_monitor = self._stderr_monitor
         self.processors[name] = processor
         return processor
     
@@ -497,3 +852,11 @@ class VideoProcessorManager:
             name: processor.get_status_info()
             for name, processor in self.processors.items()
         }
+    
+    def shutdown(self) -> None:
+        """停止所有正在运行的处理器并关闭共享的stderr监控器"""
+        for processor in self.processors.values():
+            if processor.status == ProcessStatus.RUNNING:
+                processor.stop_process()
+        if self._stderr_monitor is not None:
+            self._stderr_monitor.close()
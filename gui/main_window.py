@@ -4,14 +4,11 @@ FFmpeg GUI工具主窗口
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
-import sys
+import queue
 import threading
 from pathlib import Path
 
-# 添加项目根目录到路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from core.ffmpeg_manager import FFmpegManager
+from core.ffmpeg_manager import FFmpegManager, format_file_size
 from core.gpu_detector import GPUDetector
 from core.video_processor import VideoProcessor, ProcessStatus
 from utils.config import config
@@ -21,6 +18,49 @@ from .widgets import (
 )
 
 
+# 文件对话框的类型过滤器，由FFmpegManager支持的扩展名生成，所有对话框共用
+_VIDEO_FILETYPES = (
+    ("视频文件", " ".join("*" + ext for ext in FFmpegManager.supported_formats['video'])),
+    ("所有文件", "*.*")
+)
+_SUBTITLE_FILETYPES = (
+    ("字幕文件", " ".join("*" + ext for ext in FFmpegManager.supported_formats['subtitle'])),
+    ("所有文件", "*.*")
+)
+
+# 生成切片输出文件名时去掉时间中的冒号
+_TIME_STRIP = str.maketrans("", "", ":")
+
+# 后台任务线程池的工作线程数（查找FFmpeg、检测GPU、获取视频信息共用）
+_IO_WORKERS = 2
+
+# 日志中显示的FFmpeg命令最大长度，超出部分以省略号代替
+_COMMAND_DISPLAY_LIMIT = 200
+
+
+def _join_for_display(parts, limit: int = _COMMAND_DISPLAY_LIMIT) -> str:
+    """
+    以空格连接命令参数用于显示，超过长度限制时截断并加省略号
+    
+    只连接到超出限制为止，长滤镜链后面的参数不会被拼接
+    
+    Args:
+        parts: 命令参数列表
+        limit: 最大显示长度
+        
+    Returns:
+        显示用的命令字符串
+    """
+    pieces = []
+    length = -1
+    for part in parts:
+        pieces.append(part)
+        length += len(part) + 1
+        if length > limit:
+            return " ".join(pieces)[:limit - 3] + "..."
+    return " ".join(pieces)
+
+
 class FFmpegGUI:
     """FFmpeg GUI主类"""
     
@@ -34,9 +74,26 @@ class FFmpegGUI:
         self.gpu_detector = GPUDetector()
         self.video_processor = VideoProcessor()
         
+        # 窗口关闭后置位，后台线程不再向已销毁的界面投递回调
+        self._closing = False
+        # 后台任务共用的线程池：任务队列由固定数量的守护线程处理。
+        # 不使用ThreadPoolExecutor，它的工作线程在解释器退出时会被等待，探测未结束时关闭窗口会卡住
+        self._io_pool: "queue.Queue" = queue.Queue()
+        for _ in range(_IO_WORKERS):
+            threading.Thread(target=self._io_worker, daemon=True).start()
+        
         # 状态变量
         self.current_video_info = {}
         self.processing_mode = tk.StringVar(value="cut")  # cut 或 subtitle
+        # 尚未显示的最新进度；界面线程刷新前到达的多次进度更新合并为一次刷新
+        self._pending_progress = None
+        self._progress_refresh_scheduled = False
+        # 上一次显示的进度字段，内容相同时跳过格式化和控件更新
+        self._last_progress_display = None
+        # 最近一次GPU检测结果 ((CUDA可用, AMD可用), 推荐模式)，字幕设置延迟创建时据此初始化
+        self._gpu_detection_result = None
+        # 验证通过的切片时间 (开始, 结束)，构建命令时直接使用，无需再次读取和解析
+        self._cut_times = None
         
         # 设置处理器回调
         self.video_processor.set_progress_callback(self._on_progress_update)
@@ -81,6 +138,14 @@ class FFmpegGUI:
         
         # 进度和日志区域
         self._create_progress_log_section(main_frame, 6)
+        
+        # 处理期间需要禁用的输入控件，创建后固定不变，只收集一次
+        self._input_widgets = [
+            child
+            for widget in (self.video_select, self.output_select)
+            for child in widget.winfo_children()
+            if isinstance(child, (ttk.Entry, ttk.Button))
+        ]
     
     def _create_ffmpeg_section(self, parent, row):
         """创建FFmpeg设置区域"""
@@ -126,15 +191,10 @@ class FFmpegGUI:
         video_frame.columnconfigure(1, weight=1)
         
         # 视频文件选择
-        video_types = [
-            ("视频文件", "*.mp4 *.avi *.mkv *.mov *.wmv *.flv *.webm *.m4v *.3gp"),
-            ("所有文件", "*.*")
-        ]
-        
         self.video_select = FileSelectFrame(
             video_frame, 
             "视频文件:", 
-            video_types,
+            _VIDEO_FILETYPES,
             config.get_last_directory("video"),
             callback=self._on_video_selected
         )
@@ -216,21 +276,29 @@ class FFmpegGUI:
             state="readonly"
         )
         quality_combo.grid(row=0, column=1, sticky="w")
+        
+        # 快速切片：直接复制流，不重新编码
+        self.stream_copy_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            quality_frame,
+            text="快速切片（不重新编码，切点对齐关键帧）",
+            variable=self.stream_copy_var
+        ).grid(row=0, column=2, sticky="w", padx=(15, 0))
     
     def _create_subtitle_settings(self):
-        """创建字幕设置"""
+        """创建字幕设置框架（其中的控件在首次切换到字幕烧录时才创建）"""
         self.subtitle_frame = ttk.Frame(self.settings_frame)
+        self._subtitle_settings_built = False
+    
+    def _populate_subtitle_settings(self):
+        """创建字幕设置控件"""
+        self._subtitle_settings_built = True
         
         # 字幕文件选择
-        subtitle_types = [
-            ("字幕文件", "*.srt *.ass *.ssa *.vtt *.sub"),
-            ("所有文件", "*.*")
-        ]
-        
         self.subtitle_select = FileSelectFrame(
             self.subtitle_frame,
             "字幕文件:",
-            subtitle_types
+            _SUBTITLE_FILETYPES
         )
         self.subtitle_select.grid(row=0, column=0, sticky="ew", pady=(0, 10))
         
@@ -258,6 +326,12 @@ class FFmpegGUI:
             state="readonly"
         )
         color_combo.grid(row=0, column=3, sticky="w")
+        
+        # 应用控件创建前已完成的GPU检测结果
+        if self._gpu_detection_result:
+            (cuda_available, amd_available), recommended = self._gpu_detection_result
+            self.subtitle_gpu_mode.set_mode_availability(cuda_available, amd_available)
+            self.subtitle_gpu_mode.set_gpu_mode(recommended)
     
     def _create_output_section(self, parent, row):
         """创建输出设置区域"""
@@ -350,6 +424,8 @@ class FFmpegGUI:
         # 从配置加载FFmpeg路径
         saved_path = config.get_ffmpeg_path()
         if saved_path and os.path.exists(saved_path):
+            # 可执行文件未变化时复用上次的探测结果，无需启动FFmpeg子进程
+            self.ffmpeg_manager.load_probe_cache_entry(config.get_ffmpeg_probe_cache())
             self.ffmpeg_select.set_file_path(saved_path)
             self._on_ffmpeg_selected(saved_path)
         else:
@@ -371,9 +447,9 @@ class FFmpegGUI:
                 else:
                     self.log_display.add_log("未找到FFmpeg，请手动选择", "WARNING")
             
-            self.root.after(0, update_ui)
+            self._post_to_ui(update_ui)
         
-        threading.Thread(target=find_thread, daemon=True).start()
+        self._run_in_background(find_thread)
     
     def _on_ffmpeg_selected(self, path: str):
         """FFmpeg路径选择回调"""
@@ -385,6 +461,11 @@ class FFmpegGUI:
             config.set_ffmpeg_path(path)
             self.log_display.add_log(f"FFmpeg设置成功: {path}")
             
+            # 保存探测结果，结果未变化时不重写配置文件
+            probe_entry = self.ffmpeg_manager.get_probe_cache_entry()
+            if probe_entry and probe_entry != config.get_ffmpeg_probe_cache():
+                config.set_ffmpeg_probe_cache(probe_entry)
+            
             # 检测GPU支持
             self._detect_gpu_support()
         else:
@@ -404,8 +485,7 @@ class FFmpegGUI:
         
         def detect_thread():
             # 检测GPU
-            gpus = self.gpu_detector.detect_gpus()
-            gpu_support = self.gpu_detector.check_ffmpeg_gpu_support(self.ffmpeg_manager.ffmpeg_path)
+            gpus, gpu_support = self.gpu_detector.detect_all(self.ffmpeg_manager.ffmpeg_path)
             
             def update_ui():
                 cuda_available = gpu_support.get("cuda", False) and \
@@ -415,7 +495,8 @@ class FFmpegGUI:
                 
                 # 更新GPU模式控件
                 self.gpu_mode.set_mode_availability(cuda_available, amd_available)
-                self.subtitle_gpu_mode.set_mode_availability(cuda_available, amd_available)
+                if self._subtitle_settings_built:
+                    self.subtitle_gpu_mode.set_mode_availability(cuda_available, amd_available)
                 
                 # 记录检测结果
                 self.log_display.add_log(f"检测到 {len(gpus)} 个GPU")
@@ -427,23 +508,60 @@ class FFmpegGUI:
                 # 设置推荐模式
                 recommended = self.gpu_detector.get_recommended_gpu_mode()
                 self.gpu_mode.set_gpu_mode(recommended)
-                self.subtitle_gpu_mode.set_gpu_mode(recommended)
+                if self._subtitle_settings_built:
+                    self.subtitle_gpu_mode.set_gpu_mode(recommended)
                 config.set_gpu_mode(recommended)
+                
+                self._gpu_detection_result = ((cuda_available, amd_available), recommended)
             
-            self.root.after(0, update_ui)
+            self._post_to_ui(update_ui)
+        
+        self._run_in_background(detect_thread)
+    
+    def _run_in_background(self, task):
+        """
+        在共享线程池中执行后台任务
         
-        threading.Thread(target=detect_thread, daemon=True).start()
+        任务自行通过_post_to_ui把结果交回界面线程
+        
+        Args:
+            task: 无参数的后台任务
+        """
+        self._io_pool.put(task)
+    
+    def _io_worker(self):
+        """线程池工作线程：依次执行队列中的任务，取到None或窗口关闭后退出"""
+        while True:
+            task = self._io_pool.get()
+            if task is None or self._closing:
+                return
+            try:
+                task()
+            except Exception as error:
+                # 任务抛出的异常转交界面线程记录到日志
+                message = f"后台任务出错: {error}"
+                self._post_to_ui(lambda: self.log_display.add_log(message, "ERROR"))
+    
+    def _post_to_ui(self, callback):
+        """
+        把回调交给界面线程执行，窗口关闭后直接丢弃
+        
+        Args:
+            callback: 无参数的界面更新函数
+        """
+        if self._closing:
+            return
+        try:
+            self.root.after(0, callback)
+        except (tk.TclError, RuntimeError):
+            # 检查标志后窗口才被销毁
+            pass
     
     def _open_video_file(self):
         """打开视频文件"""
-        video_types = [
-            ("视频文件", "*.mp4 *.avi *.mkv *.mov *.wmv *.flv *.webm *.m4v *.3gp"),
-            ("所有文件", "*.*")
-        ]
-        
         filename = filedialog.askopenfilename(
             title="选择视频文件",
-            filetypes=video_types,
+            filetypes=_VIDEO_FILETYPES,
             initialdir=config.get_last_directory("video")
         )
         
@@ -453,7 +571,10 @@ class FFmpegGUI:
     
     def _on_video_selected(self, path: str):
         """视频文件选择回调"""
-        if not os.path.exists(path):
+        # 只stat一次，文件大小的备用显示复用这次的结果
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
             return
         
         config.set_last_directory("video", path)
@@ -474,8 +595,9 @@ class FFmpegGUI:
         
         # 获取视频信息
         if self.ffmpeg_manager.is_valid:
+            self.log_display.add_log("正在获取视频信息...")
+            
             def get_info_thread():
-                self.log_display.add_log("正在获取视频信息...")
                 info = self.ffmpeg_manager.get_video_info(path)
                 
                 def update_ui():
@@ -489,9 +611,9 @@ class FFmpegGUI:
                     else:
                         self.log_display.add_log("视频信息获取完成 (部分信息可能不可用)", "WARNING")
                 
-                self.root.after(0, update_ui)
+                self._post_to_ui(update_ui)
             
-            threading.Thread(target=get_info_thread, daemon=True).start()
+            self._run_in_background(get_info_thread)
         else:
             self.video_info.update_info({
                 "duration": "需要FFmpeg", 
@@ -500,7 +622,7 @@ class FFmpegGUI:
                 "audio_codec": "需要FFmpeg",
                 "bitrate": "需要FFmpeg",
                 "frame_rate": "需要FFmpeg",
-                "file_size": self._get_file_size_fallback(path)
+                "file_size": self._get_file_size_fallback(st.st_size)
             })
     
     def _on_mode_changed(self):
@@ -516,6 +638,8 @@ class FFmpegGUI:
             self.cut_frame.grid(row=0, column=0, sticky="ew")
             self.settings_frame.config(text="切片设置")
         elif mode == "subtitle":
+            if not self._subtitle_settings_built:
+                self._populate_subtitle_settings()
             self.subtitle_frame.grid(row=0, column=0, sticky="ew")
             self.settings_frame.config(text="字幕烧录设置")
     
@@ -575,12 +699,16 @@ class FFmpegGUI:
                 return False
             
             # 验证时间逻辑
-            start_seconds = self.ffmpeg_manager.time_to_seconds(self.start_time.get_time_string())
-            end_seconds = self.ffmpeg_manager.time_to_seconds(self.end_time.get_time_string())
+            start_time = self.start_time.get_time_string()
+            end_time = self.end_time.get_time_string()
+            start_seconds = self.ffmpeg_manager.time_to_seconds(start_time)
+            end_seconds = self.ffmpeg_manager.time_to_seconds(end_time)
             
             if start_seconds >= end_seconds:
                 messagebox.showerror("错误", "结束时间必须大于开始时间")
                 return False
+            
+            self._cut_times = (start_time, end_time)
         
         elif mode == "subtitle":
             # 检查字幕文件
@@ -614,16 +742,19 @@ class FFmpegGUI:
         video_name = os.path.splitext(os.path.basename(video_path))[0]
         
         if mode == "cut":
-            start_time = self.start_time.get_time_string()
-            end_time = self.end_time.get_time_string()
+            # 复用_validate_inputs读取并验证过的时间字符串
+            start_time, end_time = self._cut_times
             gpu_mode = self.gpu_mode.get_gpu_mode()
             quality = self.quality_var.get()
+            reencode = not self.stream_copy_var.get()
             
-            output_name = f"{video_name}_cut_{start_time.replace(':', '')}-{end_time.replace(':', '')}.mp4"
+            # 流复制时保留输入的容器格式
+            ext = self.ffmpeg_manager.get_cut_output_extension(video_path, reencode)
+            output_name = f"{video_name}_cut_{start_time.translate(_TIME_STRIP)}-{end_time.translate(_TIME_STRIP)}{ext}"
             output_path = os.path.join(output_dir, output_name)
             
             command = self.ffmpeg_manager.build_cut_command(
-                video_path, output_path, start_time, end_time, gpu_mode, quality
+                video_path, output_path, start_time, end_time, gpu_mode, quality, reencode
             )
         
         elif mode == "subtitle":
@@ -647,12 +778,7 @@ class FFmpegGUI:
         
         # 显示实际的FFmpeg命令（调试用）
         self.log_display.add_log(f"GPU模式: {gpu_mode}")
-        cmd_str = " ".join(command)
-        if len(cmd_str) > 200:
-            cmd_display = cmd_str[:197] + "..."
-        else:
-            cmd_display = cmd_str
-        self.log_display.add_log(f"FFmpeg命令: {cmd_display}")
+        self.log_display.add_log(f"FFmpeg命令: {_join_for_display(command)}")
         
         return command
     
@@ -664,28 +790,50 @@ class FFmpegGUI:
         self.stop_button.config(state="normal" if processing else "disabled")
         
         # 禁用/启用输入控件
-        for widget in [self.video_select, self.output_select]:
-            for child in widget.winfo_children():
-                if isinstance(child, (ttk.Entry, ttk.Button)):
-                    child.config(state=state)
+        for widget in self._input_widgets:
+            widget.config(state=state)
     
     def _on_progress_update(self, progress):
-        """进度更新回调"""
-        def update():
-            percentage = progress.percentage
-            status_text = f"进度: {percentage:.1f}% - {progress.time_processed}"
-            detail_text = f"速度: {progress.speed} | 比特率: {progress.bitrate}"
-            
-            if progress.eta != "unknown":
-                detail_text += f" | 预计剩余: {progress.eta}"
-            
-            self.progress_display.update_progress(percentage, status_text, detail_text)
+        """进度更新回调（在处理线程中调用）"""
+        # 先保存最新进度再检查标志，刷新已排队时它会读到这次的进度
+        self._pending_progress = progress
+        if not self._progress_refresh_scheduled and not self._closing:
+            self._progress_refresh_scheduled = True
+            try:
+                self.root.after_idle(self._refresh_progress)
+            except (tk.TclError, RuntimeError):
+                pass
+    
+    def _refresh_progress(self):
+        """在界面线程中显示最新进度"""
+        # 先清除标志再读取进度，之后到达的更新会重新排队
+        self._progress_refresh_scheduled = False
+        progress = self._pending_progress
+        if progress is None:
+            return
+        
+        # FFmpeg暂停输出时会重复相同的统计信息，显示内容不变则无需重绘
+        percentage = progress.percentage
+        display = (round(percentage, 1), progress.time_processed, progress.speed,
+                   progress.bitrate, progress.eta)
+        if display == self._last_progress_display:
+            return
+        self._last_progress_display = display
+        
+        status_text = f"进度: {percentage:.1f}% - {progress.time_processed}"
+        detail_text = f"速度: {progress.speed} | 比特率: {progress.bitrate}"
         
-        self.root.after(0, update)
+        if progress.eta != "unknown":
+            detail_text += f" | 预计剩余: {progress.eta}"
+        
+        self.progress_display.update_progress(percentage, status_text, detail_text)
     
     def _on_status_update(self, status, message):
         """状态更新回调"""
         def update():
+            # 状态变化可能改写进度显示，下一次进度更新必须重新绘制
+            self._last_progress_display = None
+            
             if status == ProcessStatus.COMPLETED:
                 self.progress_display.update_progress(100, "处理完成", "")
                 self.log_display.add_log("处理完成")
@@ -706,7 +854,7 @@ class FFmpegGUI:
             else:
                 self.log_display.add_log(message)
         
-        self.root.after(0, update)
+        self._post_to_ui(update)
     
     def _clear_log(self):
         """清空日志"""
@@ -733,17 +881,18 @@ class FFmpegGUI:
         
         messagebox.showinfo("FFmpeg信息", info_text)
     
-    def _get_file_size_fallback(self, file_path: str) -> str:
-        """备用文件大小获取方法"""
-        try:
-            size_bytes = os.path.getsize(file_path)
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if size_bytes < 1024.0:
-                    return f"{size_bytes:.1f} {unit}"
-                size_bytes /= 1024.0
-            return f"{size_bytes:.1f} TB"
-        except Exception:
-            return "未知"
+    def _get_file_size_fallback(self, size_bytes: int) -> str:
+        """
+        备用文件大小显示（FFmpeg不可用时）
+        
+        Args:
+            size_bytes: 已stat得到的文件字节数
+            
+        Returns:
+            带单位的文件大小字符串
+        """
+        # 与视频信息中的file_size使用同一格式化方法（按位数直接确定单位）
+        return format_file_size(size_bytes)
     
     def _show_about(self):
         """显示关于信息"""
@@ -769,11 +918,17 @@ class FFmpegGUI:
         
         # 停止正在运行的处理
         if self.video_processor.status == ProcessStatus.RUNNING:
-            if messagebox.askyesno("确认", "有处理正在进行，确定要退出吗？"):
-                self.video_processor.stop_process()
-                self.root.destroy()
-        else:
-            self.root.destroy()
+            if not messagebox.askyesno("确认", "有处理正在进行，确定要退出吗？"):
+                return
+            self.video_processor.stop_process()
+        
+        # 后台任务的结果不再投递到界面，并终止仍在运行的探测进程
+        self._closing = True
+        # 唤醒空闲的工作线程使其退出，尚未开始的任务不再执行
+        for _ in range(_IO_WORKERS):
+            self._io_pool.put(None)
+        self.ffmpeg_manager.terminate_probes()
+        self.root.destroy()
     
     def run(self):
         """运行GUI应用"""
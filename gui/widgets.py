@@ -5,9 +5,46 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import re
+import time
+from collections import deque
 from typing import Callable, Optional, Any
 
 
+# 时间输入框允许的内容：最多两位ASCII数字
+_TIME_FIELD_RE = re.compile(r'[0-9]{1,2}')
+
+# 时间各字段的取值上限（不含），与FFmpegManager.validate_time_format一致：小时0-23
+_HOUR_LIMIT = 24
+_MINUTE_SECOND_LIMIT = 60
+
+
+def _is_valid_time_field(value: str, limit: int) -> bool:
+    """
+    检查时间输入框的内容是否有效
+    
+    Args:
+        value: 输入框内容
+        limit: 取值上限（不含）
+        
+    Returns:
+        是否为不超过上限的1-2位数字
+    """
+    # 先用正则排除非数字、符号和空格，之后的int()不会失败
+    return bool(_TIME_FIELD_RE.fullmatch(value)) and int(value) < limit
+
+# 视频信息的显示顺序及标签
+_VIDEO_INFO_LABELS = (
+    ("duration", "时长"),
+    ("resolution", "分辨率"),
+    ("video_codec", "视频编码"),
+    ("audio_codec", "音频编码"),
+    ("bitrate", "比特率"),
+    ("frame_rate", "帧率"),
+    ("file_size", "文件大小")
+)
+
+
 class FileSelectFrame(ttk.Frame):
     """文件选择控件"""
     
@@ -149,10 +186,12 @@ class TimeInputFrame(ttk.Frame):
         """
         super().__init__(parent)
         
+        # 只拆分一次；缺少的部分补"00"，格式不完整的默认值也不会出错
+        hours, minutes, seconds = (default_time.split(':') + ['00', '00', '00'])[:3]
         self.time_vars = {
-            'hours': tk.StringVar(value=default_time.split(':')[0]),
-            'minutes': tk.StringVar(value=default_time.split(':')[1]),
-            'seconds': tk.StringVar(value=default_time.split(':')[2])
+            'hours': tk.StringVar(value=hours),
+            'minutes': tk.StringVar(value=minutes),
+            'seconds': tk.StringVar(value=seconds)
         }
         
         self._create_widgets(label_text)
@@ -187,6 +226,13 @@ class TimeInputFrame(ttk.Frame):
     
     def _setup_validation(self):
         """设置输入验证"""
+        # 各输入框的取值上限（不含），按控件路径名查找
+        self._field_limits = {
+            str(self.hour_entry): _HOUR_LIMIT,
+            str(self.minute_entry): _MINUTE_SECOND_LIMIT,
+            str(self.second_entry): _MINUTE_SECOND_LIMIT
+        }
+        
         # 注册验证函数
         vcmd = (self.register(self._validate_time_input), '%P', '%W')
         
@@ -208,15 +254,7 @@ class TimeInputFrame(ttk.Frame):
         if not value:
             return True
         
-        try:
-            num = int(value)
-            # 小时可以是任意正整数，分钟和秒需要小于60
-            if 'hour' in widget_name:
-                return num >= 0 and len(value) <= 2
-            else:
-                return 0 <= num < 60 and len(value) <= 2
-        except ValueError:
-            return False
+        return _is_valid_time_field(value, self._field_limits.get(widget_name, _MINUTE_SECOND_LIMIT))
     
     def get_time_string(self) -> str:
         """获取时间字符串"""
@@ -243,9 +281,9 @@ class TimeInputFrame(ttk.Frame):
             minutes = int(parts[1])
             seconds = int(parts[2])
             
-            return (hours >= 0 and 
-                   0 <= minutes < 60 and 
-                   0 <= seconds < 60)
+            return (0 <= hours < _HOUR_LIMIT and 
+                   0 <= minutes < _MINUTE_SECOND_LIMIT and 
+                   0 <= seconds < _MINUTE_SECOND_LIMIT)
         except (ValueError, IndexError):
             return False
 
@@ -262,6 +300,11 @@ class ProgressFrame(ttk.Frame):
         """
         super().__init__(parent)
         
+        # 当前显示的内容，值未变化时不再调用Tk
+        self._shown_percentage = 0.0
+        self._shown_status = "就绪"
+        self._shown_detail = ""
+        
         self._create_widgets()
     
     def _create_widgets(self):
@@ -291,19 +334,24 @@ class ProgressFrame(ttk.Frame):
             status_text: 状态文本
             detail_text: 详细信息文本
         """
-        self.progress_bar['value'] = percentage
+        # 只更新变化的部分；重绘交给Tk的空闲处理统一进行，不强制立即刷新
+        if percentage != self._shown_percentage:
+            self._shown_percentage = percentage
+            self.progress_bar['value'] = percentage
         
-        if status_text:
+        if status_text and status_text != self._shown_status:
+            self._shown_status = status_text
             self.progress_label.config(text=status_text)
         
-        if detail_text:
+        if detail_text and detail_text != self._shown_detail:
+            self._shown_detail = detail_text
             self.detail_label.config(text=detail_text)
-        
-        # 强制更新显示
-        self.update_idletasks()
     
     def reset(self):
         """重置进度显示"""
+        self._shown_percentage = 0.0
+        self._shown_status = "就绪"
+        self._shown_detail = ""
         self.progress_bar['value'] = 0
         self.progress_label.config(text="就绪")
         self.detail_label.config(text="")
@@ -324,6 +372,8 @@ class GPUModeFrame(ttk.Frame):
         
         self.callback = callback
         self.gpu_mode = tk.StringVar(value="cuda")
+        # 已应用的 (CUDA可用, AMD可用)，未变化时不再重新配置单选按钮
+        self._availability = None
         
         self._create_widgets()
     
@@ -381,13 +431,13 @@ class GPUModeFrame(ttk.Frame):
             cuda_available: CUDA是否可用
             amd_available: AMD是否可用
         """
-        state_cuda = "normal" if cuda_available else "disabled"
-        state_amd = "normal" if amd_available else "disabled"
-        
-        self.cuda_radio.config(state=state_cuda)
-        self.amd_radio.config(state=state_amd)
+        availability = (cuda_available, amd_available)
+        if availability != self._availability:
+            self._availability = availability
+            self.cuda_radio.config(state="normal" if cuda_available else "disabled")
+            self.amd_radio.config(state="normal" if amd_available else "disabled")
         
-        # 如果当前选择的模式不可用，切换到CPU
+        # 如果当前选择的模式不可用，切换到CPU（设置变量不会触发单选按钮的command回调）
         current_mode = self.gpu_mode.get()
         if (current_mode == "cuda" and not cuda_available) or \
            (current_mode == "amd" and not amd_available):
@@ -406,6 +456,9 @@ class VideoInfoFrame(ttk.Frame):
         """
         super().__init__(parent)
         
+        # 当前显示的文本，内容相同时不再重写文本框
+        self._shown_text = None
+        
         self._create_widgets()
     
     def _create_widgets(self):
@@ -436,21 +489,19 @@ class VideoInfoFrame(ttk.Frame):
         Args:
             info_dict: 视频信息字典
         """
-        self.info_text.config(state='normal')
-        self.info_text.delete(1.0, tk.END)
-        
         if info_dict:
-            info_text = "视频信息:\n"
-            info_text += f"时长: {info_dict.get('duration', '未知')}\n"
-            info_text += f"分辨率: {info_dict.get('resolution', '未知')}\n"
-            info_text += f"视频编码: {info_dict.get('video_codec', '未知')}\n"
-            info_text += f"音频编码: {info_dict.get('audio_codec', '未知')}\n"
-            info_text += f"比特率: {info_dict.get('bitrate', '未知')}\n"
-            info_text += f"帧率: {info_dict.get('frame_rate', '未知')}\n"
-            info_text += f"文件大小: {info_dict.get('file_size', '未知')}"
+            info_text = "视频信息:\n" + "\n".join(
+                f"{label}: {info_dict.get(key, '未知')}" for key, label in _VIDEO_INFO_LABELS
+            )
         else:
             info_text = "请选择视频文件以查看信息"
         
+        if info_text == self._shown_text:
+            return
+        self._shown_text = info_text
+        
+        self.info_text.config(state='normal')
+        self.info_text.delete(1.0, tk.END)
         self.info_text.insert(1.0, info_text)
         self.info_text.config(state='disabled')
     
@@ -462,15 +513,27 @@ class VideoInfoFrame(ttk.Frame):
 class LogFrame(ttk.Frame):
     """日志显示控件"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, max_lines: int = 2000):
         """
         初始化日志显示控件
         
         Args:
             parent: 父控件
+            max_lines: 保留的最大日志行数，超出后删除最早的行
         """
         super().__init__(parent)
         
+        self.max_lines = max_lines
+        # 待写入的日志条目，在界面空闲时一次性写入文本框；
+        # 两次写入之间条目过多时只保留最新的部分
+        self._pending_entries = deque(maxlen=max_lines)
+        self._flush_scheduled = False
+        # 文本框中当前的行数，用于判断是否需要删除旧行，无需向Tk查询
+        self._line_count = 0
+        # 上一条日志所在的整秒及其格式化的时间戳，同一秒内的日志直接复用
+        self._timestamp_second = -1
+        self._timestamp_text = ""
+        
         self._create_widgets()
     
     def _create_widgets(self):
@@ -502,18 +565,45 @@ class LogFrame(ttk.Frame):
             message: 日志消息
             level: 日志级别 (INFO, WARNING, ERROR)
         """
-        import datetime
-        
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}\n"
+        # 时间戳在调用时生成，写入文本框则合并到界面空闲时进行
+        now = time.time()
+        second = int(now)
+        if second != self._timestamp_second:
+            local = time.localtime(now)
+            self._timestamp_second = second
+            self._timestamp_text = f"{local.tm_hour:02d}:{local.tm_min:02d}:{local.tm_sec:02d}"
+        self._pending_entries.append(f"[{self._timestamp_text}] {level}: {message}\n")
+        
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush_logs)
+    
+    def _flush_logs(self):
+        """把待写入的日志一次性写入文本框，只滚动一次"""
+        self._flush_scheduled = False
+        if not self._pending_entries:
+            return
+        
+        entries = "".join(self._pending_entries)
+        self._pending_entries.clear()
+        self._line_count += entries.count("\n")
         
         self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, log_entry)
+        self.log_text.insert(tk.END, entries)
+        
+        # 超出行数上限时一次删除最早的多余行，文本框内容始终有界
+        excess = self._line_count - self.max_lines
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self._line_count = self.max_lines
+        
         self.log_text.see(tk.END)  # 滚动到最新内容
         self.log_text.config(state='disabled')
     
     def clear_log(self):
         """清空日志"""
+        self._pending_entries.clear()
+        self._line_count = 0
         self.log_text.config(state='normal')
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state='disabled')
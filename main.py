@@ -23,8 +23,6 @@ FFmpeg视频处理工具
 
 import sys
 import os
-import tkinter as tk
-from tkinter import messagebox
 
 # 确保可以导入项目模块
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -107,8 +105,10 @@ def main():
         except Exception as e:
             print(f"启动失败: {e}")
             
-            # 如果GUI可用，显示错误对话框
+            # 如果GUI可用，显示错误对话框（tkinter只在需要时导入）
             try:
+                import tkinter as tk
+                from tkinter import messagebox
                 root = tk.Tk()
                 root.withdraw()  # 隐藏主窗口
                 messagebox.showerror("启动错误", f"程序启动失败:\n\n{str(e)}")
@@ -0,0 +1,88 @@
+"""
+FFmpeg管理模块测试
+"""
+import os
+import unittest
+from unittest import mock
+
+from core.ffmpeg_manager import FFmpegManager
+
+
+class LoadProbeCacheEntryTest(unittest.TestCase):
+    """load_probe_cache_entry 忽略格式错误的条目"""
+    
+    def setUp(self):
+        self.manager = FFmpegManager()
+        self.valid = {
+            "path": os.path.abspath("ffmpeg"),
+            "mtime_ns": 123,
+            "version": "6.1",
+            "gpu_support": {"cuda": True, "nvenc": False}
+        }
+    
+    def _load(self, entry):
+        with mock.patch("core.ffmpeg_manager.GPUDetector.prime_ffmpeg_support") as prime:
+            self.manager.load_probe_cache_entry(entry)
+        return prime
+    
+    def test_valid_entry_primes_caches(self):
+        prime = self._load(self.valid)
+        prime.assert_called_once_with(self.valid["path"], 123, self.valid["gpu_support"])
+        self.assertEqual(self.manager._path_test_cache[(self.valid["path"], 123)], "6.1")
+    
+    def test_malformed_entries_ignored(self):
+        malformed = [
+            None,
+            [],
+            {},
+            dict(self.valid, path=123),
+            dict(self.valid, path=""),
+            dict(self.valid, mtime_ns="123"),
+            dict(self.valid, mtime_ns=True),
+            dict(self.valid, version=6.1),
+            dict(self.valid, gpu_support=[["cuda", True]]),
+            dict(self.valid, gpu_support={"cuda": "yes"}),
+        ]
+        for entry in malformed:
+            with self.subTest(entry=entry):
+                prime = self._load(entry)
+                prime.assert_not_called()
+                self.assertEqual(self.manager._path_test_cache, {})
+
+
+
+class StreamCopyCutCommandTest(unittest.TestCase):
+    """流复制切片的输出容器和流选择"""
+    
+    def setUp(self):
+        self.manager = FFmpegManager()
+        self.manager.ffmpeg_path = "ffmpeg"
+        self.manager.is_valid = True
+    
+    def _build(self, input_file, output_file):
+        return self.manager.build_cut_command(
+            input_file, output_file, "00:00:01", "00:00:05", reencode=False
+        )
+    
+    def test_output_keeps_input_container(self):
+        for name, ext in (("a.mkv", ".mkv"), ("a.WMV", ".wmv"), ("a.flv", ".flv"), ("a.mp4", ".mp4")):
+            with self.subTest(name=name):
+                self.assertEqual(self.manager.get_cut_output_extension(name, reencode=False), ext)
+                self.assertEqual(self.manager.get_cut_output_extension(name, reencode=True), ".mp4")
+    
+    def test_same_container_copies_all_streams(self):
+        command = self._build("in.mkv", "out.mkv")
+        self.assertNotIn("-map", command)
+        self.assertEqual(command[-5:], ["-c", "copy", "-avoid_negative_ts", "make_zero", "out.mkv"])
+        self.assertLess(command.index("-ss"), command.index("-i"))
+    
+    def test_container_change_maps_only_video_and_audio(self):
+        command = self._build("in.mkv", "out.mp4")
+        self.assertEqual(
+            command[command.index("-i") + 2:command.index("-c")],
+            ["-map", "0:v:0", "-map", "0:a?", "-sn", "-dn"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+GPU检测模块测试
+"""
+import unittest
+from unittest import mock
+
+from core.gpu_detector import GPUDetector
+
+
+_ENCODERS_WITH_NVENC = """encoders:
+ v....d libx264              libx264 h.264 / avc / mpeg-4 avc / mpeg-4 part 10 (codec h264)
+ v....d h264_nvenc           nvidia nvenc h.264 encoder (codec h264)
+ v....d hevc_nvenc           nvidia nvenc hevc encoder (codec hevc)
+"""
+
+_HWACCELS_CUDA_OPENCL = """hardware acceleration methods:
+cuda
+opencl
+"""
+
+
+class CheckFFmpegGPUSupportTest(unittest.TestCase):
+    """check_ffmpeg_gpu_support 的检测逻辑"""
+    
+    def _check(self, outputs):
+        detector = GPUDetector()
+        calls = []
+        
+        def run_ffmpeg(path, option):
+            calls.append(option)
+            return outputs.get(option)
+        
+        with mock.patch.object(detector, "_run_ffmpeg", side_effect=run_ffmpeg), \
+                mock.patch("core.gpu_detector._ffmpeg_cache_key", return_value=None):
+            return detector.check_ffmpeg_gpu_support("ffmpeg"), calls
+    
+    def test_detects_autodetected_features(self):
+        support, calls = self._check({
+            "-hwaccels": _HWACCELS_CUDA_OPENCL,
+            "-encoders": _ENCODERS_WITH_NVENC,
+        })
+        self.assertTrue(support["cuda"])
+        self.assertTrue(support["opencl"])
+        self.assertTrue(support["nvenc"])
+        self.assertFalse(support["amf"])
+    
+    def test_runs_only_two_queries(self):
+        _, calls = self._check({})
+        self.assertEqual(sorted(calls), ["-encoders", "-hwaccels"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+视频处理模块测试
+"""
+import os
+import shutil
+import stat
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from core.video_processor import ProcessStatus, VideoProcessorManager, _SHARED_MONITOR_SUPPORTED
+
+
+# 模拟FFmpeg：输出几行进度信息后以参数指定的返回码退出
+_FAKE_ENCODER = """#!/bin/sh
+for i in 1 2 3; do printf "frame=  $i fps= 25 time=00:00:0$i.00 bitrate=100.0kbits/s speed=1.0x\\r" >&2; sleep 0.1; done
+exit ${1:-0}
+"""
+
+# 模拟关闭stderr后仍继续运行一段时间的进程
+_FAKE_LINGERING = """#!/bin/sh
+exec 2>&-
+sleep ${1:-2}
+"""
+
+
+@unittest.skipUnless(_SHARED_MONITOR_SUPPORTED, "共享stderr监控器仅在非Windows平台启用")
+class SharedStderrMonitorTest(unittest.TestCase):
+    """多个处理器共享stderr监控线程"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.encoder = self._write_script("fakeenc.sh", _FAKE_ENCODER)
+        self.lingering = self._write_script("linger.sh", _FAKE_LINGERING)
+        self.manager = VideoProcessorManager()
+    
+    def tearDown(self):
+        self.manager.shutdown()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def _write_script(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+        return path
+    
+    def test_concurrent_processes_report_own_status(self):
+        ok = self.manager.create_processor("ok")
+        failing = self.manager.create_processor("failing")
+        self.assertTrue(ok.start_process([self.encoder, "0"]))
+        self.assertTrue(failing.start_process([self.encoder, "3"]))
+        
+        self.assertTrue(ok.wait_for_completion(5))
+        self.assertTrue(failing.wait_for_completion(5))
+        self.assertEqual(ok.status, ProcessStatus.COMPLETED)
+        self.assertEqual(failing.status, ProcessStatus.ERROR)
+        self.assertEqual(ok.progress.time_processed_sec, 3.0)
+    
+    def test_lingering_process_does_not_block_other_jobs(self):
+        lingering = self.manager.create_processor("lingering")
+        encoder = self.manager.create_processor("encoder")
+        self.assertTrue(lingering.start_process([self.lingering, "3"]))
+        # 等待监控线程读到第一个进程stderr的EOF并开始回收
+        time.sleep(0.2)
+        self.assertTrue(encoder.start_process([self.encoder, "0"]))
+        
+        self.assertTrue(encoder.wait_for_completion(2))
+        self.assertEqual(encoder.status, ProcessStatus.COMPLETED)
+        self.assertFalse(lingering.wait_for_completion(0))
+        
+        lingering.stop_process()
+        self.assertTrue(lingering.wait_for_completion(5))
+    
+    def test_start_after_shutdown_fails_cleanly(self):
+        processor = self.manager.create_processor("late")
+        self.manager.shutdown()
+        
+        self.assertFalse(processor.start_process([self.encoder, "0"]))
+        self.assertEqual(processor.status, ProcessStatus.ERROR)
+        self.assertIsNone(processor.process)
+        self.assertTrue(processor.wait_for_completion(0))
+    
+    def test_register_failure_terminates_process(self):
+        processor = self.manager.create_processor("race")
+        monitor = processor._stderr_monitor
+        # 模拟检查之后、注册之前监控器被关闭
+        with mock.patch.object(type(monitor), "closed", new_callable=mock.PropertyMock, return_value=False):
+            monitor.close()
+            self.assertFalse(processor.start_process([self.lingering, "5"]))
+        
+        self.assertEqual(processor.status, ProcessStatus.ERROR)
+        self.assertIsNotNone(processor.process.returncode)
+        self.assertTrue(processor.wait_for_completion(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""
+自定义控件的输入验证测试
+"""
+import unittest
+
+from core.ffmpeg_manager import FFmpegManager
+from gui.widgets import _HOUR_LIMIT, _MINUTE_SECOND_LIMIT, _is_valid_time_field
+
+
+class TimeFieldValidationTest(unittest.TestCase):
+    """时间输入框的按键验证与后端时间格式校验保持一致"""
+    
+    def test_hours_match_backend_validator(self):
+        manager = FFmpegManager()
+        for hours in range(100):
+            value = str(hours)
+            with self.subTest(hours=hours):
+                self.assertEqual(
+                    _is_valid_time_field(value, _HOUR_LIMIT),
+                    manager.validate_time_format(f"{value}:00:00")
+                )
+    
+    def test_hours_24_to_99_rejected(self):
+        for hours in range(24, 100):
+            with self.subTest(hours=hours):
+                self.assertFalse(_is_valid_time_field(str(hours), _HOUR_LIMIT))
+        self.assertTrue(_is_valid_time_field("23", _HOUR_LIMIT))
+        self.assertTrue(_is_valid_time_field("0", _HOUR_LIMIT))
+    
+    def test_minutes_and_seconds(self):
+        self.assertTrue(_is_valid_time_field("59", _MINUTE_SECOND_LIMIT))
+        self.assertFalse(_is_valid_time_field("60", _MINUTE_SECOND_LIMIT))
+    
+    def test_rejects_non_digits(self):
+        for value in ("+5", " 5", "5a", "123", "", "٣"):
+            with self.subTest(value=value):
+                self.assertFalse(_is_valid_time_field(value, _HOUR_LIMIT))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,13 +4,24 @@
 """
 import json
 import os
+import atexit
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 
+# 设置项变化后延迟保存的时间（秒），期间的多次修改合并为一次写入
+_SAVE_DELAY = 0.5
+
+
 class ConfigManager:
     """配置管理器"""
     
+    __slots__ = (
+        'config_file', 'config_data', '_default_config',
+        '_save_timer', '_save_lock', '_saved_text'
+    )
+    
     def __init__(self, config_file: str = "config.json"):
         """
         初始化配置管理器
@@ -20,6 +31,11 @@ class ConfigManager:
         """
         self.config_file = Path(config_file)
         self.config_data: Dict[str, Any] = {}
+        # 延迟保存的定时器及保护它和文件写入的锁
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        # 最近一次写入文件的内容，内容未变化时跳过写入
+        self._saved_text: Optional[str] = None
         self._default_config = {
             "ffmpeg_path": "",
             "last_video_directory": "",
@@ -31,20 +47,28 @@ class ConfigManager:
             "recent_files": [],
             "subtitle_font_size": 24,
             "subtitle_font_color": "white",
-            "max_recent_files": 10
+            "max_recent_files": 10,
+            "ffmpeg_probe_cache": {}     # FFmpeg版本号和GPU支持的探测结果
         }
         self.load_config()
+        # 退出时写入尚未保存的修改
+        atexit.register(self.flush)
     
     def load_config(self) -> None:
         """加载配置文件"""
         try:
             if self.config_file.exists():
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config_data = json.load(f)
-                    # 合并默认配置，确保所有键都存在
-                    for key, value in self._default_config.items():
-                        if key not in self.config_data:
-                            self.config_data[key] = value
+                    loaded = json.load(f)
+                if not isinstance(loaded, dict):
+                    # 文件内容是合法JSON但不是对象（如列表或null），无法合并
+                    print(f"配置文件格式无效: 顶层应为对象，实际为 {type(loaded).__name__}")
+                    self.config_data = self._default_config.copy()
+                    return
+                # 合并默认配置，确保所有键都存在；文件中的值优先
+                self.config_data = {**self._default_config, **loaded}
+                # 以加载的内容作为已保存的基准，首次修改未改变内容时同样跳过写入
+                self._saved_text = json.dumps(self.config_data, indent=4, ensure_ascii=False)
             else:
                 self.config_data = self._default_config.copy()
                 self.save_config()
@@ -54,18 +78,47 @@ class ConfigManager:
     
     def save_config(self) -> bool:
         """
-        保存配置到文件
+        立即保存配置到文件
+        
+        先写入同目录下的临时文件再替换原文件，写入中途出错不会损坏已有配置
         
         Returns:
             bool: 保存是否成功
         """
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, indent=4, ensure_ascii=False)
-            return True
-        except (PermissionError, OSError) as e:
-            print(f"配置文件保存失败: {e}")
-            return False
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            
+            # 复制一份再序列化，其他线程同时修改设置也不影响本次写入
+            text = json.dumps(dict(self.config_data), indent=4, ensure_ascii=False)
+            if text == self._saved_text:
+                return True
+            
+            temp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+            try:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(temp_file, self.config_file)
+                self._saved_text = text
+                return True
+            except (PermissionError, OSError) as e:
+                print(f"配置文件保存失败: {e}")
+                return False
+    
+    def _schedule_save(self) -> None:
+        """延迟保存配置，短时间内的多次修改只写入一次文件"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(_SAVE_DELAY, self.save_config)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self) -> None:
+        """立即写入尚未保存的修改"""
+        if self._save_timer is not None:
+            self.save_config()
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -97,7 +150,7 @@ class ConfigManager:
     def set_ffmpeg_path(self, path: str) -> None:
         """设置FFmpeg路径"""
         self.set("ffmpeg_path", path)
-        self.save_config()
+        self._schedule_save()
     
     def get_last_directory(self, dir_type: str) -> str:
         """
@@ -124,8 +177,14 @@ class ConfigManager:
             path: 目录路径
         """
         key = f"last_{dir_type}_directory"
-        self.set(key, os.path.dirname(path) if os.path.isfile(path) else path)
-        self.save_config()
+        # 以路径分隔符结尾的一定是目录，无需查询文件系统；
+        # 其他情况不能只凭扩展名判断（目录名也可能带点），仍需检查
+        if path.endswith(('/', os.sep)):
+            directory = path
+        else:
+            directory = os.path.dirname(path) if os.path.isfile(path) else path
+        self.set(key, directory)
+        self._schedule_save()
     
     def add_recent_file(self, file_path: str) -> None:
         """
@@ -135,21 +194,17 @@ class ConfigManager:
             file_path: 文件路径
         """
         recent_files = self.get("recent_files", [])
+        max_files = self.get("max_recent_files", 10)
         
-        # 如果文件已存在，先移除
-        if file_path in recent_files:
-            recent_files.remove(file_path)
-        
-        # 添加到开头
-        recent_files.insert(0, file_path)
+        # 已经是最近的文件时无需任何改动
+        if recent_files and recent_files[0] == file_path and len(recent_files) <= max_files:
+            return
         
-        # 限制最大数量
-        max_files = self.get("max_recent_files", 10)
-        if len(recent_files) > max_files:
-            recent_files = recent_files[:max_files]
+        # 一次遍历生成新列表：新文件放在开头，去掉原有的同一文件，并限制最大数量
+        recent_files = ([file_path] + [f for f in recent_files if f != file_path])[:max_files]
         
         self.set("recent_files", recent_files)
-        self.save_config()
+        self._schedule_save()
     
     def get_recent_files(self) -> list:
         """获取最近使用的文件列表"""
@@ -158,9 +213,18 @@ class ConfigManager:
         existing_files = [f for f in recent_files if os.path.exists(f)]
         if len(existing_files) != len(recent_files):
             self.set("recent_files", existing_files)
-            self.save_config()
+            self._schedule_save()
         return existing_files
     
+    def get_ffmpeg_probe_cache(self) -> Dict[str, Any]:
+        """获取保存的FFmpeg探测结果"""
+        return self.get("ffmpeg_probe_cache", {})
+    
+    def set_ffmpeg_probe_cache(self, entry: Dict[str, Any]) -> None:
+        """保存FFmpeg探测结果"""
+        self.set("ffmpeg_probe_cache", entry)
+        self._schedule_save()
+    
     def get_gpu_mode(self) -> str:
         """获取GPU模式"""
         return self.get("default_gpu_mode", "cuda")
@@ -169,7 +233,7 @@ class ConfigManager:
         """设置GPU模式"""
         if mode in ["cuda", "amd", "cpu"]:
             self.set("default_gpu_mode", mode)
-            self.save_config()
+            self._schedule_save()
     
     def get_window_geometry(self) -> str:
         """获取窗口几何信息"""
@@ -178,12 +242,12 @@ class ConfigManager:
     def set_window_geometry(self, geometry: str) -> None:
         """设置窗口几何信息"""
         self.set("window_geometry", geometry)
-        self.save_config()
+        self._schedule_save()
     
     def reset_to_defaults(self) -> None:
         """重置为默认配置"""
         self.config_data = self._default_config.copy()
-        self.save_config()
+        self._schedule_save()
 
 
 # 全局配置实例